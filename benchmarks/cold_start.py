@@ -0,0 +1,137 @@
+"""
+Cold-start report: import time per module for project.server, and time from process start to the
+first successful response of /api/hello-world with the database connected before serving versus in
+the background (DB_CONNECT_IN_BACKGROUND), with and without lazy route registration (LAZY_ROUTES).
+
+Each server is a fresh `uvicorn project.server:app` process, so the numbers include interpreter
+start-up, imports, the lifespan and the first request, as on a Cloud Run cold start. It needs a
+generated Prisma client and a reachable DATABASE_URL.
+
+Usage:
+    python -m benchmarks.cold_start [--top 25] [--repeat 5] [--path /api/hello-world]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Tuple
+
+MODES = {
+    "connect, eager routes": {
+        "DB_CONNECT_IN_BACKGROUND": "false",
+        "LAZY_ROUTES": "false",
+    },
+    "connect, lazy routes": {
+        "DB_CONNECT_IN_BACKGROUND": "false",
+        "LAZY_ROUTES": "true",
+    },
+    "background, lazy routes": {
+        "DB_CONNECT_IN_BACKGROUND": "true",
+        "LAZY_ROUTES": "true",
+    },
+}
+
+
+def import_times(env: Dict[str, str]) -> List[Tuple[str, int, int]]:
+    """
+    Returns (module, self us, cumulative us) for every module imported by project.server.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import project.server"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_response(env: Dict[str, str], path: str, timeout: float) -> float:
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "project.server:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(
+                    f"http://127.0.0.1:{port}{path}", timeout=1
+                ) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.005)
+        raise RuntimeError(f"No response from {path} within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(top: int, repeat: int, path: str, timeout: float) -> None:
+    env = dict(os.environ)
+    for mode, overrides in MODES.items():
+        rows = import_times({**env, **overrides})
+        if mode == "connect, eager routes":
+            print(f"Slowest imports of project.server (eager routes), top {top}:")
+            print(f"{'module':<50}{'self ms':>10}{'cum ms':>10}")
+            for module, self_us, cumulative_us in sorted(
+                rows, key=lambda row: row[2], reverse=True
+            )[:top]:
+                print(
+                    f"{module:<50}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}"
+                )
+            print()
+            print("project modules:")
+            for module, self_us, cumulative_us in rows:
+                if module.startswith("project."):
+                    print(
+                        f"{module:<50}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}"
+                    )
+            print()
+            print(f"{'mode (medians)':<26}{'import ms':>10}{'first response ms':>20}")
+        # Import times are noisy; report the median over `repeat` fresh interpreters.
+        total = statistics.median(
+            next(
+                row[2]
+                for row in import_times({**env, **overrides})
+                if row[0] == "project.server"
+            )
+            for _ in range(repeat)
+        )
+        first = statistics.median(
+            time_to_first_response({**env, **overrides}, path, timeout)
+            for _ in range(repeat)
+        )
+        print(f"{mode:<26}{total / 1000:>10.1f}{first * 1000:>20.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--path", default="/api/hello-world")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    main(args.top, args.repeat, args.path, args.timeout)
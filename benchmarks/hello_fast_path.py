@@ -0,0 +1,97 @@
+"""
+Compares /hello throughput for the pydantic response path, the precomputed fast path and a bare
+ASGI app returning the same bytes (the ceiling).
+
+Requests are fed straight into the ASGI callable, so the numbers exclude network and server
+overhead and isolate the framework and serialization cost per request.
+
+Usage:
+    python -m benchmarks.hello_fast_path [--requests 20000] [--path /hello]
+"""
+
+import argparse
+import asyncio
+import time
+
+import project.fast_responses
+import project.server
+
+BODY = b'{"message":"hello world"}'
+
+
+async def bare_asgi_app(scope, receive, send):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-length", str(len(BODY)).encode("latin-1")),
+                (b"content-type", b"application/json"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": BODY})
+
+
+async def drive(app, path: str, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    statuses = []
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    # Warm up routing tables, caches and the precomputed body before timing.
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    statuses.clear()
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+    if set(statuses) != {200}:
+        raise RuntimeError(f"Unexpected status codes for {path}: {set(statuses)}")
+    return elapsed
+
+
+async def main(path: str, requests: int) -> None:
+    results = {}
+    project.fast_responses.FAST_PATH_ENABLED = False
+    results["pydantic"] = await drive(project.server.app, path, requests)
+    project.fast_responses.FAST_PATH_ENABLED = True
+    results["fast path"] = await drive(project.server.app, path, requests)
+    results["bare ASGI"] = await drive(bare_asgi_app, path, requests)
+
+    baseline = results["pydantic"]
+    print(f"{requests} sequential GET {path}")
+    print(f"{'mode':<12}{'req/s':>12}{'us/req':>10}{'speedup':>10}")
+    for mode, elapsed in results.items():
+        print(
+            f"{mode:<12}{requests / elapsed:>12.0f}"
+            f"{elapsed / requests * 1e6:>10.1f}{baseline / elapsed:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--path", default="/hello")
+    args = parser.parse_args()
+    asyncio.run(main(args.path, args.requests))
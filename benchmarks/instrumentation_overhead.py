@@ -0,0 +1,43 @@
+"""
+Measures the per-request cost of InstrumentationMiddleware by wrapping a bare ASGI app that returns
+a fixed body, so the difference between the two runs is the instrumentation alone.
+
+Usage:
+    python -m benchmarks.instrumentation_overhead [--requests 200000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+
+import project.instrumentation
+from benchmarks.hello_fast_path import bare_asgi_app, drive
+
+PATH = "/hello"
+
+
+class _Route:
+    path = PATH
+    endpoint = None
+
+
+async def main(requests: int, repeat: int) -> None:
+    instrumented = project.instrumentation.InstrumentationMiddleware(
+        bare_asgi_app, routes=[_Route()]
+    )
+    # Take the best of several runs so scheduler noise doesn't show up as overhead.
+    bare = min([await drive(bare_asgi_app, PATH, requests) for _ in range(repeat)])
+    wrapped = min([await drive(instrumented, PATH, requests) for _ in range(repeat)])
+    bare_us = bare / requests * 1e6
+    wrapped_us = wrapped / requests * 1e6
+    print(f"{requests} sequential GET {PATH}, best of {repeat}")
+    print(f"{'bare ASGI':<14}{bare_us:>8.2f} us/req")
+    print(f"{'instrumented':<14}{wrapped_us:>8.2f} us/req")
+    print(f"{'overhead':<14}{wrapped_us - bare_us:>8.2f} us/req")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.repeat))
@@ -0,0 +1,497 @@
+"""
+Load test for every route in project.server: drives each route at fixed concurrency levels and
+reports requests/s, p50/p95/p99 latency and the memory allocated per request.
+
+The app is booted in-process (lifespan included) and requests are fed straight into the ASGI
+callable, so the numbers exclude network and HTTP parsing and isolate the application cost. By
+default Prisma is replaced by the in-memory stand-in in benchmarks.memory_db; pass `--db postgres`
+to run against the database in DATABASE_URL instead (benchmark rows are created under a
+`bench-<run>-` email prefix and deleted afterwards).
+
+Allocations are measured on a separate sequential pass under tracemalloc, as the peak number of
+bytes allocated while a request is handled, so tracing doesn't skew the latency numbers.
+
+Routes that hash passwords are bound by BCRYPT_ROUNDS; set it (e.g. BCRYPT_ROUNDS=4) to benchmark
+the surrounding code rather than bcrypt.
+
+Usage:
+    python -m benchmarks.load_test [--db memory|postgres] [--concurrency 1 16 64]
+        [--requests 200] [--routes login,users] [--output results.json]
+        [--compare baseline.json] [--tolerance 0.1] [--results results.json]
+"""
+
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import benchmarks.memory_db
+import prisma.models
+import project.loginUser_service
+import project.password_hashing
+import project.rate_limit
+import project.server
+
+PASSWORD = "benchmark-password"
+
+WARMUP_REQUESTS = 20
+
+
+class Scenario(NamedTuple):
+    """
+    One route under test. `make_request` turns a run-wide sequence number into the request's
+    path, query string and body, so writes never collide.
+    """
+
+    name: str
+    method: str
+    make_request: Callable[[int], Tuple[str, str, bytes]]
+    content_type: Optional[str] = None
+    setup: Optional[Callable[[int], Awaitable[None]]] = None
+
+
+class Fixture:
+    """
+    The users a run reads, updates and deletes, plus an Admin token to call the user routes with.
+    """
+
+    def __init__(self, users: int) -> None:
+        self.users = users
+        self.prefix = f"bench-{uuid.uuid4().hex[:8]}-"
+        self.user_ids: List[int] = []
+        self.admin_email = f"{self.prefix}admin@example.com"
+        self.token = ""
+        self.victims: "collections.deque[int]" = collections.deque()
+        self.hashed = ""
+        self._batches = itertools.count()
+
+    async def seed(self) -> None:
+        self.hashed = await project.password_hashing.hash_password(PASSWORD)
+        await prisma.models.User.prisma().create(
+            data={"email": self.admin_email, "password": self.hashed, "role": "Admin"}
+        )
+        self.user_ids = await self.create_users("user", self.users)
+        login = await project.loginUser_service.loginUser(self.admin_email, PASSWORD)
+        self.token = login.token
+
+    async def create_users(self, kind: str, count: int) -> List[int]:
+        batch = next(self._batches)
+        await prisma.models.User.prisma().create_many(
+            data=[
+                {
+                    "email": f"{self.prefix}{kind}{batch}-{i}@example.com",
+                    "password": self.hashed,
+                }
+                for i in range(count)
+            ]
+        )
+        users = await prisma.models.User.prisma().find_many(
+            where={"email": {"startswith": f"{self.prefix}{kind}{batch}-"}}
+        )
+        return [user.id for user in users]
+
+    async def reserve_victims(self, count: int) -> None:
+        users = await self.create_users("victim", count)
+        self.victims.extend(users)
+
+    async def cleanup(self) -> None:
+        await prisma.models.User.prisma().delete_many(
+            where={"email": {"startswith": self.prefix}}
+        )
+
+    def user_id(self, n: int) -> int:
+        return self.user_ids[n % len(self.user_ids)]
+
+
+def build_scenarios(fixture: Fixture) -> List[Scenario]:
+    def static(path: str) -> Callable[[int], Tuple[str, str, bytes]]:
+        return lambda n: (path, "", b"")
+
+    def update(path: str) -> Callable[[int], Tuple[str, str, bytes]]:
+        def make(n: int) -> Tuple[str, str, bytes]:
+            id = fixture.user_id(n)
+            return (
+                path,
+                f"id={id}&email={fixture.prefix}user{id}@example.com"
+                f"&password={PASSWORD}&role=User",
+                b"",
+            )
+
+        return make
+
+    def import_body(n: int) -> Tuple[str, str, bytes]:
+        rows = (
+            json.dumps(
+                {
+                    "email": f"{fixture.prefix}import{n}-{i}@example.com",
+                    "password": PASSWORD,
+                }
+            )
+            for i in range(10)
+        )
+        return "/api/users/import", "", "\n".join(rows).encode("utf-8")
+
+    return [
+        Scenario("GET /hello", "GET", static("/hello")),
+        Scenario("GET /health-check", "GET", static("/health-check")),
+        Scenario("GET /healthcheck", "GET", static("/healthcheck")),
+        Scenario("GET /api/health-check", "GET", static("/api/health-check")),
+        Scenario("GET /api/hello-world", "GET", static("/api/hello-world")),
+        Scenario("GET /health/live", "GET", static("/health/live")),
+        Scenario("GET /health/ready", "GET", static("/health/ready")),
+        Scenario("GET /metrics", "GET", static("/metrics")),
+        Scenario(
+            "GET /api/docs",
+            "GET",
+            lambda n: ("/api/docs", "", b"{}"),
+            content_type="application/json",
+        ),
+        Scenario(
+            "GET /api/documentation",
+            "GET",
+            lambda n: ("/api/documentation", "", b"{}"),
+            content_type="application/json",
+        ),
+        Scenario(
+            "POST /api/users/login",
+            "POST",
+            lambda n: (
+                "/api/users/login",
+                f"username={fixture.admin_email}&password={PASSWORD}",
+                b"",
+            ),
+        ),
+        Scenario(
+            "POST /users",
+            "POST",
+            lambda n: (
+                "/users",
+                f"email={fixture.prefix}create{n}@example.com&password={PASSWORD}&role=User",
+                b"",
+            ),
+        ),
+        Scenario(
+            "POST /api/users/register",
+            "POST",
+            lambda n: (
+                "/api/users/register",
+                f"username=register{n}&email={fixture.prefix}register{n}@example.com"
+                f"&password={PASSWORD}",
+                b"",
+            ),
+        ),
+        Scenario(
+            "GET /api/users/{userId}",
+            "GET",
+            lambda n: (
+                f"/api/users/{fixture.user_id(n)}",
+                f"id={fixture.user_id(n)}",
+                b"",
+            ),
+        ),
+        Scenario(
+            "GET /users/:id",
+            "GET",
+            lambda n: ("/users/:id", f"id={fixture.user_id(n)}", b""),
+        ),
+        Scenario(
+            "GET /api/users/batch",
+            "GET",
+            lambda n: (
+                "/api/users/batch",
+                "ids=" + ",".join(str(fixture.user_id(n + i)) for i in range(10)),
+                b"",
+            ),
+        ),
+        Scenario(
+            "PUT /api/users/{userId}",
+            "PUT",
+            lambda n: update(f"/api/users/{fixture.user_id(n)}")(n),
+        ),
+        Scenario("PUT /users/:id", "PUT", update("/users/:id")),
+        Scenario(
+            "DELETE /api/users/{userId}",
+            "DELETE",
+            lambda n: (
+                f"/api/users/{fixture.victims[0]}",
+                f"id={fixture.victims.popleft()}",
+                b"",
+            ),
+            setup=fixture.reserve_victims,
+        ),
+        Scenario(
+            "GET /api/users",
+            "GET",
+            lambda n: ("/api/users", f"after={fixture.user_id(n) - 1}&limit=50", b""),
+        ),
+        Scenario("GET /api/users/export", "GET", static("/api/users/export")),
+        Scenario(
+            "POST /api/users/import",
+            "POST",
+            import_body,
+            content_type="application/x-ndjson",
+        ),
+    ]
+
+
+async def call(
+    app: Any,
+    method: str,
+    path: str,
+    query: str,
+    body: bytes,
+    headers: List[Tuple[bytes, bytes]],
+    chunks: Optional[List[bytes]] = None,
+) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "root_path": "",
+        "query_string": query.encode("latin-1"),
+        "headers": headers + [(b"content-length", str(len(body)).encode("latin-1"))],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            # Streaming responses wait on this for a disconnect; never deliver one.
+            await asyncio.Event().wait()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif chunks is not None:
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # Unhandled errors count as failed requests instead of aborting the run.
+        return 500
+    return status
+
+
+def _headers(fixture: Fixture, scenario: Scenario) -> List[Tuple[bytes, bytes]]:
+    headers = [
+        (b"host", b"bench"),
+        (b"authorization", f"Bearer {fixture.token}".encode("latin-1")),
+    ]
+    if scenario.content_type:
+        headers.append((b"content-type", scenario.content_type.encode("latin-1")))
+    return headers
+
+
+async def run_level(
+    app: Any,
+    fixture: Fixture,
+    scenario: Scenario,
+    sequence: "itertools.count[int]",
+    concurrency: int,
+    requests: int,
+    alloc_samples: int,
+) -> Dict[str, Any]:
+    headers = _headers(fixture, scenario)
+    if scenario.setup is not None:
+        await scenario.setup(WARMUP_REQUESTS + requests + alloc_samples)
+
+    async def one() -> Tuple[int, float]:
+        path, query, body = scenario.make_request(next(sequence))
+        start = time.perf_counter()
+        status = await call(app, scenario.method, path, query, body, headers)
+        return status, time.perf_counter() - start
+
+    for _ in range(WARMUP_REQUESTS):
+        await one()
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            status, elapsed = await one()
+            latencies.append(elapsed)
+            if not 200 <= status < 300:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    allocated = []
+    for _ in range(alloc_samples):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await one()
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "route": scenario.name,
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "alloc_kib": round(statistics.mean(allocated) / 1024, 1) if allocated else None,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    restore = None
+    if args.db == "memory":
+        restore = benchmarks.memory_db.install(benchmarks.memory_db.MemoryDatabase())
+    app = project.server.app
+    # Every request comes from one client and account; measure the login itself, not the throttle.
+    project.rate_limit.LOGIN_RATE_LIMIT_PER_IP = 0
+    project.rate_limit.LOGIN_RATE_LIMIT_PER_ACCOUNT = 0
+    fixture = Fixture(args.users)
+    sequence = itertools.count()
+    results = []
+    try:
+        async with app.router.lifespan_context(app):
+            await fixture.seed()
+            try:
+                for scenario in build_scenarios(fixture):
+                    if args.routes and not any(r in scenario.name for r in args.routes):
+                        continue
+                    for concurrency in args.concurrency:
+                        result = await run_level(
+                            app,
+                            fixture,
+                            scenario,
+                            sequence,
+                            concurrency,
+                            args.requests,
+                            args.alloc_samples,
+                        )
+                        results.append(result)
+                        print(_format_row(result), flush=True)
+            finally:
+                await fixture.cleanup()
+    finally:
+        if restore is not None:
+            restore()
+    return {
+        "meta": {
+            "db": args.db,
+            "requests": args.requests,
+            "users": args.users,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+HEADER = (
+    f"{'route':<30}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    f"{'p99 ms':>10}{'KiB/req':>9}{'errors':>8}"
+)
+
+
+def _format_row(result: Dict[str, Any]) -> str:
+    alloc = result["alloc_kib"]
+    return (
+        f"{result['route']:<30}{result['concurrency']:>6}{result['rps']:>10.0f}"
+        f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        f"{alloc if alloc is not None else '-':>9}{result['errors']:>8}"
+    )
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Prints the change of every (route, concurrency) pair present in both result sets and returns
+    the pairs whose throughput dropped, or whose p99 latency grew, by more than `tolerance`.
+    """
+    before = {(r["route"], r["concurrency"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"{'route':<30}{'conc':>6}{'req/s':>10}{'p99':>10}{'KiB/req':>10}")
+    for result in current["results"]:
+        key = (result["route"], result["concurrency"])
+        old = before.get(key)
+        if old is None:
+            continue
+        rps = result["rps"] / old["rps"] - 1
+        p99 = result["p99_ms"] / old["p99_ms"] - 1 if old["p99_ms"] else 0.0
+        if old["alloc_kib"] and result["alloc_kib"] is not None:
+            alloc = f"{result['alloc_kib'] / old['alloc_kib'] - 1:>+10.1%}"
+        else:
+            alloc = f"{'-':>10}"
+        regressed = rps < -tolerance or p99 > tolerance
+        print(
+            f"{key[0]:<30}{key[1]:>6}{rps:>+10.1%}{p99:>+10.1%}{alloc}"
+            + ("  REGRESSION" if regressed else "")
+        )
+        if regressed:
+            regressions.append(f"{key[0]} @ {key[1]}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", choices=("memory", "postgres"), default="memory")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--alloc-samples", type=int, default=20)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument(
+        "--routes",
+        type=lambda value: value.split(","),
+        help="Only run routes whose name contains one of these comma-separated strings.",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument(
+        "--compare", help="Diff the results against this baseline file."
+    )
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    parser.add_argument(
+        "--results", help="Compare this results file instead of running the benchmark."
+    )
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        print(HEADER)
+        current = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), current, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions: {', '.join(regressions)}")
+            sys.exit(1)
@@ -0,0 +1,247 @@
+"""
+In-memory stand-in for the Prisma client, so the server can be benchmarked without Postgres.
+
+It implements the subset of the Prisma model actions the services and the benchmarks use
+(find_first, find_unique, find_many, count, create, create_many, update, update_many, delete and
+delete_many with equality, `in`, `gt` and `startswith` filters) and the raw queries issued by the
+warm-up, the health prober and listUsers. `install()` points `prisma.models.*`,
+`prisma.get_client()` and the shared client's query_raw at it and turns
+project.database.connect/disconnect into no-ops.
+"""
+
+import re
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import prisma
+import prisma.errors
+import prisma.models
+import project.database
+
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "User": {"role": "User", "version": 0},
+    "HealthCheckModule": {"content": "hello world"},
+    "APIDocumentationModule": {
+        "title": "API Documentation",
+        "endpoint": "/health-check",
+        "response": "hello world",
+    },
+}
+
+UNIQUE: Dict[str, tuple] = {"User": ("email",)}
+
+_UNSET = object()
+
+_LIST_QUERY = re.compile(
+    r"SELECT (?P<columns>[\w, ]+) FROM users WHERE (?P<conditions>.+)"
+    r" ORDER BY id LIMIT \$(?P<limit>\d+)$"
+)
+
+
+def _matches(row: Any, where: Optional[Dict[str, Any]]) -> bool:
+    for field, condition in (where or {}).items():
+        value = getattr(row, field)
+        if not isinstance(condition, dict):
+            condition = {"equals": condition}
+        for op, arg in condition.items():
+            if op == "equals" and value != arg:
+                return False
+            if op == "in" and value not in arg:
+                return False
+            if op == "gt" and not value > arg:
+                return False
+            if op == "startswith" and not value.startswith(arg):
+                return False
+    return True
+
+
+class Table:
+    """
+    The rows of one model, kept in insertion (i.e. id) order.
+    """
+
+    def __init__(self, model: str) -> None:
+        self.model = model
+        self.rows: Dict[int, Any] = {}
+        self.next_id = 1
+
+    def insert(self, data: Dict[str, Any]) -> Any:
+        record = dict(DEFAULTS.get(self.model, {}), **data)
+        for field in UNIQUE.get(self.model, ()):
+            if any(getattr(r, field) == record[field] for r in self.rows.values()):
+                raise prisma.errors.UniqueViolationError(
+                    {
+                        "user_facing_error": {
+                            "error_code": "P2002",
+                            "message": f"Unique constraint failed on the fields: (`{field}`)",
+                        }
+                    }
+                )
+        row = SimpleNamespace(id=self.next_id, **record)
+        self.rows[row.id] = row
+        self.next_id += 1
+        return row
+
+    def select(self, where: Optional[Dict[str, Any]] = None) -> List[Any]:
+        if where and set(where) == {"id"} and not isinstance(where["id"], dict):
+            row = self.rows.get(where["id"])
+            return [row] if row is not None else []
+        return [row for row in self.rows.values() if _matches(row, where)]
+
+
+class ModelActions:
+    """
+    The Prisma actions of one model, backed by a Table.
+    """
+
+    def __init__(self, table: Table) -> None:
+        self.table = table
+
+    async def find_first(self, where: Optional[Dict[str, Any]] = None, **kwargs):
+        rows = self.table.select(where)
+        return rows[0] if rows else None
+
+    async def find_unique(self, where: Dict[str, Any], **kwargs):
+        return await self.find_first(where)
+
+    async def find_many(
+        self,
+        where: Optional[Dict[str, Any]] = None,
+        take: Optional[int] = None,
+        skip: Optional[int] = None,
+        **kwargs,
+    ):
+        rows = self.table.select(where)[skip or 0 :]
+        return rows[:take] if take is not None else rows
+
+    async def count(self, where: Optional[Dict[str, Any]] = None, **kwargs) -> int:
+        return len(self.table.select(where))
+
+    async def create(self, data: Dict[str, Any], **kwargs):
+        return self.table.insert(data)
+
+    async def create_many(
+        self, data: List[Dict[str, Any]], skip_duplicates: bool = False, **kwargs
+    ) -> int:
+        created = 0
+        for record in data:
+            try:
+                self.table.insert(record)
+            except prisma.errors.UniqueViolationError:
+                if not skip_duplicates:
+                    raise
+                continue
+            created += 1
+        return created
+
+    async def update(self, data: Dict[str, Any], where: Dict[str, Any], **kwargs):
+        row = await self.find_first(where)
+        if row is None:
+            return None
+        for field, value in data.items():
+            if isinstance(value, dict) and "increment" in value:
+                value = getattr(row, field) + value["increment"]
+            elif field in UNIQUE.get(self.table.model, ()) and any(
+                getattr(r, field) == value and r is not row
+                for r in self.table.rows.values()
+            ):
+                raise prisma.errors.UniqueViolationError(
+                    {"user_facing_error": {"error_code": "P2002"}}
+                )
+            setattr(row, field, value)
+        return row
+
+    async def update_many(self, data: Dict[str, Any], where: Dict[str, Any], **kwargs):
+        rows = self.table.select(where)
+        for row in rows:
+            await self.update(data, {"id": row.id})
+        return len(rows)
+
+    async def delete(self, where: Dict[str, Any], **kwargs):
+        row = await self.find_first(where)
+        if row is not None:
+            del self.table.rows[row.id]
+        return row
+
+    async def delete_many(self, where: Optional[Dict[str, Any]] = None, **kwargs):
+        rows = self.table.select(where)
+        for row in rows:
+            del self.table.rows[row.id]
+        return len(rows)
+
+
+class MemoryDatabase:
+    """
+    A set of in-memory tables standing in for the Prisma client. Like a provisioned database, it
+    starts with one HealthCheckModule and one APIDocumentationModule row.
+    """
+
+    def __init__(self) -> None:
+        self.tables = {model: Table(model) for model in DEFAULTS}
+        self.tables["HealthCheckModule"].insert({})
+        self.tables["APIDocumentationModule"].insert({})
+
+    def actions(self, model: str) -> ModelActions:
+        return ModelActions(self.tables[model])
+
+    async def query_raw(self, query: str, *args: Any) -> List[Dict[str, Any]]:
+        if query.startswith("SELECT 1"):
+            return [{"ok": 1}]
+        match = _LIST_QUERY.match(query)
+        if match is None:
+            raise NotImplementedError(f"Unsupported raw query: {query}")
+        columns = [column.strip() for column in match["columns"].split(",")]
+        rows = list(self.tables["User"].rows.values())
+        for condition in match["conditions"].split(" AND "):
+            field, op, placeholder = condition.split(" ", 2)
+            arg = args[int(placeholder[1:].split("::")[0]) - 1]
+            if op == ">":
+                rows = [row for row in rows if getattr(row, field) > arg]
+            elif op == "=":
+                rows = [row for row in rows if getattr(row, field) == arg]
+            elif op == "LIKE":
+                prefix = re.sub(r"\\(.)", r"\1", arg[:-1])
+                rows = [row for row in rows if row.email.startswith(prefix)]
+        rows = rows[: args[int(match["limit"]) - 1]]
+        return [{column: getattr(row, column) for column in columns} for row in rows]
+
+
+def install(db: MemoryDatabase) -> Callable[[], None]:
+    """
+    Routes every Prisma call made by the services to `db`.
+
+    Returns:
+        Callable[[], None]: Restores the real client.
+    """
+    patches = [
+        (
+            getattr(prisma.models, model),
+            "prisma",
+            classmethod(lambda cls, client=None, _model=model: db.actions(_model)),
+        )
+        for model in db.tables
+    ]
+    patches.append((prisma, "get_client", lambda: db))
+    # The health prober pings the shared client directly.
+    patches.append((project.database.db_client, "query_raw", db.query_raw))
+
+    async def noop() -> None:
+        pass
+
+    patches.append((project.database, "connect", noop))
+    patches.append((project.database, "disconnect", noop))
+    originals = [
+        (target, name, vars(target).get(name, _UNSET)) for target, name, _ in patches
+    ]
+    for target, name, value in patches:
+        setattr(target, name, value)
+
+    def restore() -> None:
+        for target, name, value in originals:
+            if value is _UNSET:
+                # It was inherited from the class, e.g. a method of the client.
+                delattr(target, name)
+            else:
+                setattr(target, name, value)
+
+    return restore
@@ -0,0 +1,67 @@
+"""
+Measures what each bcrypt work factor costs: single-hash latency, login verifications per second
+through the hash worker pool, and the longest event-loop stall seen while verifying.
+
+Usage:
+    python -m benchmarks.password_hashing [--rounds 10 11 12 13] [--logins 64]
+"""
+
+import argparse
+import asyncio
+import time
+
+import project.password_hashing
+
+
+async def max_loop_stall(stop: asyncio.Event, interval: float = 0.001) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def measure(rounds: int, logins: int) -> dict:
+    start = time.perf_counter()
+    hashed = await project.password_hashing.hash_password("benchmark", rounds)
+    hash_seconds = time.perf_counter() - start
+
+    stop = asyncio.Event()
+    stall = asyncio.create_task(max_loop_stall(stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[
+            project.password_hashing.verify_password("benchmark", hashed)
+            for _ in range(logins)
+        ],
+        return_exceptions=True,
+    )
+    verify_seconds = time.perf_counter() - start
+    stop.set()
+    return {
+        "rounds": rounds,
+        "hash_ms": hash_seconds * 1000,
+        "verifies_per_s": sum(r is True for r in results) / verify_seconds,
+        "shed": sum(isinstance(r, Exception) for r in results),
+        "max_stall_ms": await stall * 1000,
+    }
+
+
+async def main(rounds: list, logins: int) -> None:
+    print(f"{logins} concurrent verifications per work factor")
+    print(f"{'rounds':>6}{'hash ms':>10}{'verify/s':>10}{'shed':>6}{'stall ms':>10}")
+    for r in rounds:
+        row = await measure(r, logins)
+        print(
+            f"{row['rounds']:>6}{row['hash_ms']:>10.1f}{row['verifies_per_s']:>10.1f}"
+            f"{row['shed']:>6}{row['max_stall_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.logins))
@@ -0,0 +1,106 @@
+"""
+Compares response encodings per route: bytes on the wire and encoding time for the stdlib JSON
+encoder (FastAPI's former default), orjson (the default NegotiatedResponse encoder) and MessagePack
+(sent for `Accept: application/msgpack`, when msgpack is installed).
+
+The content encoded is what each route actually returns: every read route (and login) is called
+once through the app, on the in-memory database, and its JSON body decoded.
+
+Usage:
+    python -m benchmarks.serialization [--users 50] [--iterations 20000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+import benchmarks.load_test
+import benchmarks.memory_db
+import project.serialization
+import project.server
+from fastapi.responses import JSONResponse
+
+
+def encoders() -> Dict[str, Callable[[Any], bytes]]:
+    formats = {"json": JSONResponse(None).render}
+    if project.serialization.orjson is not None:
+        formats["orjson"] = project.serialization.orjson.dumps
+    if project.serialization.msgpack is not None:
+        formats["msgpack"] = project.serialization.msgpack.packb
+    return formats
+
+
+async def route_contents(users: int) -> Dict[str, Any]:
+    """
+    Returns the decoded JSON content of every read route and of login, keyed by scenario name.
+    """
+    app = project.server.app
+    fixture = benchmarks.load_test.Fixture(users)
+    contents = {}
+    async with app.router.lifespan_context(app):
+        await fixture.seed()
+        for scenario in benchmarks.load_test.build_scenarios(fixture):
+            if scenario.method != "GET" and "login" not in scenario.name:
+                continue
+            path, query, body = scenario.make_request(0)
+            chunks: List[bytes] = []
+            status = await benchmarks.load_test.call(
+                app,
+                scenario.method,
+                path,
+                query,
+                body,
+                benchmarks.load_test._headers(fixture, scenario),
+                chunks,
+            )
+            try:
+                content = json.loads(b"".join(chunks))
+            except ValueError:
+                # Streamed NDJSON/CSV exports are not response models.
+                continue
+            if status == 200:
+                contents[scenario.name] = content
+    return contents
+
+
+def time_encoder(
+    encode: Callable[[Any], bytes], content: Any, iterations: int, repeat: int
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            encode(content)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations
+
+
+def main(users: int, iterations: int, repeat: int) -> None:
+    restore = benchmarks.memory_db.install(benchmarks.memory_db.MemoryDatabase())
+    try:
+        contents = asyncio.run(route_contents(users))
+    finally:
+        restore()
+    formats = encoders()
+    print(f"Encoding time per response (best of {repeat} x {iterations}) and body size")
+    print(
+        f"{'route':<30}"
+        + "".join(f"{name + ' us':>12}{name + ' B':>11}" for name in formats)
+    )
+    for route, content in contents.items():
+        row = f"{route:<30}"
+        for encode in formats.values():
+            seconds = time_encoder(encode, content, iterations, repeat)
+            row += f"{seconds * 1e6:>12.2f}{len(encode(content)):>11}"
+        print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.users, args.iterations, args.repeat)
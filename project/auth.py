@@ -0,0 +1,186 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+import project.errors
+import project.loginUser_service
+import project.metrics
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "10000"))
+
+token_cache_hits = project.metrics.Counter(
+    "token_cache_hits_total", "JWTs accepted from the verified-token cache."
+)
+token_cache_misses = project.metrics.Counter(
+    "token_cache_misses_total", "JWTs that needed signature verification."
+)
+token_verification_seconds = project.metrics.Histogram(
+    "token_verification_seconds",
+    "Time spent authenticating a bearer token, by outcome.",
+    ("outcome",),
+)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already-verified JWT claims, keyed by a digest of the token.
+
+    Repeat requests carrying the same token skip the HMAC check and JSON decoding. Entries are only
+    served until the token's `exp` claim; raw tokens are never stored.
+
+    Args:
+        maxsize (int): The maximum number of tokens kept.
+    """
+
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], Optional[float]]]" = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        claims, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return claims
+
+    def put(self, key: bytes, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        self._entries[key] = (claims, float(exp) if exp is not None else None)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+token_cache = VerifiedTokenCache()
+
+
+def verify_token(token: str) -> Dict[str, Any]:
+    """
+    Verifies a JWT issued by loginUser and returns its claims, using the verified-token cache.
+
+    Args:
+        token (str): The encoded JWT.
+
+    Returns:
+        Dict[str, Any]: The token claims, e.g. {"user_id": 1, "role": "User", "exp": 1718000000}.
+
+    Raises:
+        jwt.InvalidTokenError: If the signature is invalid or the token has expired.
+
+    Example:
+        claims = verify_token(login_response.token)
+        > {'user_id': 1, 'role': 'User', 'exp': 1718000000}
+    """
+    start = time.perf_counter()
+    key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+    claims = token_cache.get(key)
+    if claims is not None:
+        token_cache_hits.inc()
+        token_verification_seconds.labels("cached").observe(time.perf_counter() - start)
+        return claims
+    token_cache_misses.inc()
+    try:
+        claims = jwt.decode(
+            token,
+            project.loginUser_service.SECRET_KEY,
+            algorithms=[project.loginUser_service.ALGORITHM],
+        )
+    except jwt.InvalidTokenError:
+        token_verification_seconds.labels("rejected").observe(
+            time.perf_counter() - start
+        )
+        raise
+    token_cache.put(key, claims)
+    token_verification_seconds.labels("verified").observe(time.perf_counter() - start)
+    return claims
+
+
+async def require_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Dict[str, Any]:
+    """
+    FastAPI dependency that rejects requests without a valid `Authorization: Bearer <jwt>` header.
+
+    Args:
+        credentials (Optional[HTTPAuthorizationCredentials]): The parsed Authorization header.
+
+    Returns:
+        Dict[str, Any]: The verified token claims.
+    """
+    if credentials is None:
+        raise project.errors.AuthenticationError(
+            "Not authenticated", headers={"WWW-Authenticate": "Bearer"}
+        )
+    try:
+        return verify_token(credentials.credentials)
+    except jwt.InvalidTokenError as e:
+        raise project.errors.AuthenticationError(
+            f"Invalid token: {e}", headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+async def optional_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Optional[Dict[str, Any]]:
+    """
+    FastAPI dependency for routes open to anonymous callers that allow more to some tokens. A token
+    that is sent must be valid.
+
+    Args:
+        credentials (Optional[HTTPAuthorizationCredentials]): The parsed Authorization header.
+
+    Returns:
+        Optional[Dict[str, Any]]: The verified token claims, or None without an Authorization header.
+    """
+    if credentials is None:
+        return None
+    return await require_token(credentials)
+
+
+def is_admin(claims: Optional[Dict[str, Any]]) -> bool:
+    """
+    Tells whether verified token claims carry the Admin role.
+
+    Args:
+        claims (Optional[Dict[str, Any]]): The verified token claims, or None for an anonymous caller.
+
+    Returns:
+        bool: True for an Admin token.
+    """
+    return claims is not None and claims.get("role") == "Admin"
+
+
+async def require_admin(
+    claims: Dict[str, Any] = Depends(require_token),
+) -> Dict[str, Any]:
+    """
+    FastAPI dependency that only lets through requests whose token carries the Admin role.
+
+    Args:
+        claims (Dict[str, Any]): The verified token claims.
+
+    Returns:
+        Dict[str, Any]: The verified token claims.
+    """
+    if not is_admin(claims):
+        raise project.errors.ForbiddenError("Admin role required")
+    return claims
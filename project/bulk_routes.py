@@ -0,0 +1,46 @@
+import project.auth
+import project.errors
+import project.exportUsers_service
+import project.importUsers_service
+import project.serialization
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response, StreamingResponse
+
+router = APIRouter()
+
+
+@router.post(
+    "/api/users/import",
+    response_model=project.importUsers_service.ImportUsersResponse,
+    dependencies=[Depends(project.auth.require_admin)],
+)
+async def api_post_importUsers(
+    request: Request,
+) -> project.importUsers_service.ImportUsersResponse | Response:
+    """
+    Creates users in bulk from a streamed NDJSON (application/x-ndjson) or CSV (text/csv) request body. Passwords are hashed in parallel and rows are inserted in batches; the response reports every rejected row. Requires an Admin token.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in ("application/x-ndjson", "text/csv"):
+        return project.serialization.NegotiatedResponse(
+            content={"error": f"Unsupported content type {content_type!r}"},
+            status_code=415,
+        )
+    res = await project.importUsers_service.importUsers(request.stream(), content_type)
+    return res
+
+
+@router.get(
+    "/api/users/export",
+    dependencies=[Depends(project.auth.require_admin)],
+)
+async def api_get_exportUsers(format: str = "ndjson") -> Response:
+    """
+    Streams all users as NDJSON or CSV (format=csv), paging through the table with a keyset cursor so the export never loads the whole table into memory. Passwords are never exported. Requires an Admin token.
+    """
+    if format not in ("ndjson", "csv"):
+        raise project.errors.InvalidRequestError(f"Unsupported format {format!r}")
+    return StreamingResponse(
+        project.exportUsers_service.exportUsers(format),
+        media_type="text/csv" if format == "csv" else "application/x-ndjson",
+    )
@@ -1,5 +1,4 @@
-import prisma
-import prisma.models
+import project.health_cache
 from pydantic import BaseModel
 
 
@@ -35,6 +34,5 @@ async def checkHealth(request: HealthCheckRequestModel) -> HealthCheckResponseMo
         response = checkHealth(request)
         > HealthCheckResponseModel(message='hello world')
     """
-    health_check_module = await prisma.models.HealthCheckModule.prisma().find_first()
-    message = health_check_module.content if health_check_module else "hello world"
+    message = await project.health_cache.health_cache.get_message()
     return HealthCheckResponseModel(message=message)
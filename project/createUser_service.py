@@ -1,7 +1,11 @@
 from enum import Enum
 
 import prisma
+import prisma.errors
 import prisma.models
+import project.errors
+import project.password_hashing
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -10,8 +14,8 @@ class Role(Enum):
     Enum representing user roles.
     """
 
-    Admin: str
-    User: str
+    Admin = "Admin"
+    User = "User"
 
 
 class CreateUserResponse(BaseModel):
@@ -24,7 +28,9 @@ class CreateUserResponse(BaseModel):
     role: Role
 
 
-async def createUser(email: str, password: str, role: Role) -> CreateUserResponse:
+async def createUser(
+    email: str, password: str, role: Role, admin: bool = False
+) -> CreateUserResponse:
     """
     This endpoint allows for the creation of a new user. It expects user details in the request body and returns the created user's information. Basic validation of input data should be performed here.
 
@@ -32,17 +38,30 @@ async def createUser(email: str, password: str, role: Role) -> CreateUserRespons
     email (str): The email address of the new user. It must be unique.
     password (str): The password for the new user.
     role (Role): The role assigned to the new user, either 'User' or 'Admin'.
+    admin (bool): Whether the caller holds an Admin token, which is required to create an Admin.
 
     Returns:
     CreateUserResponse: Response model for the created user information.
 
+    Raises:
+    ForbiddenError: If a caller without an Admin token asks for the Admin role.
+
     Example:
         createUser("test@example.com", "password123", Role.User)
         > CreateUserResponse(id=1, email="test@example.com", role=Role.User)
     """
-    created_user = await prisma.models.User.prisma().create(
-        data={"email": email, "password": password, "role": role.name}
-    )
+    if role is Role.Admin and not admin:
+        raise project.errors.ForbiddenError(
+            "Creating an Admin user requires an Admin token"
+        )
+    hashed = await project.password_hashing.hash_password(password)
+    try:
+        created_user = await prisma.models.User.prisma().create(
+            data={"email": email, "password": hashed, "role": role.name}
+        )
+    except prisma.errors.UniqueViolationError:
+        raise project.errors.ConflictError(f"Email {email} is already in use")
+    await project.user_cache.user_cache.put(created_user)
     return CreateUserResponse(
         id=created_user.id, email=created_user.email, role=Role[created_user.role]
     )
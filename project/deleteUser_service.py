@@ -1,5 +1,7 @@
 import prisma
 import prisma.models
+import project.errors
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -22,12 +24,15 @@ async def deleteUser(id: int) -> DeleteUserResponseModel:
     Returns:
         DeleteUserResponseModel: Response model for deleting a user. It confirms whether the deletion was successful or not.
 
+    Raises:
+        NotFoundError: If no user with the given ID exists.
+
     Example:
         deleteUser(1)
         > DeleteUserResponseModel(message="User successfully deleted.")
     """
     user = await prisma.models.User.prisma().delete(where={"id": id})
-    if user:
-        return DeleteUserResponseModel(message="User successfully deleted.")
-    else:
-        return DeleteUserResponseModel(message="User not found.")
+    await project.user_cache.user_cache.invalidate(id, user.email if user else None)
+    if not user:
+        raise project.errors.NotFoundError(f"User with ID {id} does not exist")
+    return DeleteUserResponseModel(message="User successfully deleted.")
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import prisma
+import prisma.models
+import project.auth
+import project.database
+from fastapi.dependencies.utils import get_flat_dependant
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# After the documentation rows failed to load, the registry is served without overrides and rebuilt
+# on the first request after this delay.
+DOCS_RETRY_SECONDS = float(os.environ.get("DOCS_RETRY_SECONDS", "5"))
+
+
+class ParameterDoc(BaseModel):
+    """
+    A request parameter of an endpoint.
+    """
+
+    name: str
+    location: str
+    type: str
+    required: bool
+
+
+class EndpointDoc(BaseModel):
+    """
+    The documentation of one endpoint, derived from its route, its service models and its docstring, with the expected response overridable from the APIDocumentationModule table.
+    """
+
+    path: str
+    method: str
+    summary: str
+    description: str
+    auth: Optional[str] = None
+    parameters: List[ParameterDoc] = []
+    response_model: Optional[str] = None
+    expected_response: Optional[str] = None
+    example_usage: str
+
+
+def _type_name(annotation: Any) -> str:
+    return getattr(annotation, "__name__", None) or str(annotation).replace(
+        "typing.", ""
+    )
+
+
+def _auth(route: APIRoute) -> Optional[str]:
+    # Covers both `dependencies=[...]` and dependencies declared as endpoint parameters.
+    calls = {dependant.call for dependant in route.dependant.dependencies}
+    if project.auth.require_admin in calls:
+        return "admin"
+    if project.auth.require_token in calls:
+        return "token"
+    return None
+
+
+def endpoint_doc(route: APIRoute, method: str) -> EndpointDoc:
+    """
+    Documents one method of a route from its metadata.
+
+    Args:
+        route (APIRoute): The route to document.
+        method (str): The HTTP method to document.
+
+    Returns:
+        EndpointDoc: The endpoint documentation, without overrides.
+
+    Example:
+        endpoint_doc(route, "GET")
+        > EndpointDoc(path='/hello', method='GET', summary="This endpoint returns a simple 'hello world' message.", ...)
+    """
+    dependant = get_flat_dependant(route.dependant)
+    parameters = [
+        ParameterDoc(
+            name=field.alias,
+            location=location,
+            type=_type_name(field.field_info.annotation),
+            required=field.required,
+        )
+        for location, fields in (
+            ("path", dependant.path_params),
+            ("query", dependant.query_params),
+            ("header", dependant.header_params),
+            ("body", dependant.body_params),
+        )
+        for field in fields
+    ]
+    description = " ".join((route.description or "").split())
+    query = "&".join(
+        f"{parameter.name}=<{parameter.name}>"
+        for parameter in parameters
+        if parameter.location == "query" and parameter.required
+    )
+    headers = ' -H "Authorization: Bearer <token>"' if _auth(route) else ""
+    return EndpointDoc(
+        path=route.path,
+        method=method,
+        summary=description.split(". ")[0].rstrip(".") + "." if description else "",
+        description=description,
+        auth=_auth(route),
+        parameters=parameters,
+        response_model=(
+            _type_name(route.response_model) if route.response_model else None
+        ),
+        example_usage=f"curl -X {method}{headers} http://<host>{route.path}"
+        + (f"?{query}" if query else ""),
+    )
+
+
+class DocsRegistry:
+    """
+    The endpoint catalogue served by /api/docs and /api/documentation.
+
+    It is built once, on first use, from the application's route table (so it covers every
+    documented route, including lazily registered ones) and the APIDocumentationModule rows, whose
+    `response` overrides the expected response of the endpoint they name. After that it is served
+    from memory; `reload()` rebuilds it, e.g. after the documentation table was edited. If the rows
+    can't be read, it is served without overrides and rebuilt on use after DOCS_RETRY_SECONDS.
+
+    Args:
+        routes (List[Any]): The application's route table, e.g. `app.routes`.
+    """
+
+    def __init__(self, routes: Optional[List[Any]] = None) -> None:
+        self.routes = routes if routes is not None else []
+        self.endpoints: List[EndpointDoc] = []
+        self.rows: List[prisma.models.APIDocumentationModule] = []
+        self.overrides: Dict[str, prisma.models.APIDocumentationModule] = {}
+        self.built = False
+        self._retry_at = 0.0
+        # Bumped on every rebuild, so derived artifacts (precomputed responses) can be rebuilt.
+        self.version = 0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> "DocsRegistry":
+        """
+        Returns the registry, building it on first use.
+
+        Returns:
+            DocsRegistry: The registry, with `endpoints` built.
+
+        Example:
+            registry = await docs_registry.get()
+            len(registry.endpoints)
+            > 18
+        """
+        if not self.built and time.monotonic() >= self._retry_at:
+            async with self._lock:
+                if not self.built and time.monotonic() >= self._retry_at:
+                    await self._build()
+        return self
+
+    async def reload(self) -> "DocsRegistry":
+        """
+        Rebuilds the catalogue from the current route table and documentation rows.
+
+        Returns:
+            DocsRegistry: The rebuilt registry.
+        """
+        async with self._lock:
+            await self._build()
+        return self
+
+    def override(self, path: str) -> Optional[prisma.models.APIDocumentationModule]:
+        """
+        Returns the APIDocumentationModule row documenting a path, if any.
+        """
+        return self.overrides.get(path)
+
+    async def _build(self) -> None:
+        try:
+            rows = await project.database.run_read(
+                "docs",
+                lambda client: prisma.models.APIDocumentationModule.prisma(
+                    client
+                ).find_many(order={"id": "asc"}),
+            )
+        except Exception:
+            logger.warning(
+                "Could not load APIDocumentationModule overrides, retrying in %g s",
+                DOCS_RETRY_SECONDS,
+                exc_info=True,
+            )
+            rows = None
+        overrides: Dict[str, prisma.models.APIDocumentationModule] = {}
+        for row in rows or []:
+            overrides.setdefault(row.endpoint, row)
+        endpoints = []
+        for route in self.routes:
+            if not isinstance(route, APIRoute) or not route.include_in_schema:
+                continue
+            for method in sorted(route.methods):
+                doc = endpoint_doc(route, method)
+                row = overrides.get(route.path)
+                if row is not None:
+                    doc.expected_response = row.response
+                endpoints.append(doc)
+        endpoints.sort(key=lambda doc: (doc.path, doc.method))
+        self.endpoints = endpoints
+        self.rows = rows or []
+        self.overrides = overrides
+        self.built = rows is not None
+        self._retry_at = time.monotonic() + DOCS_RETRY_SECONDS
+        self.version += 1
+        logger.info(
+            "Built documentation for %d endpoints with %d overrides",
+            len(endpoints),
+            len(overrides),
+        )
+
+
+docs_registry = DocsRegistry()
@@ -0,0 +1,49 @@
+import project.auth
+import project.getAPIDocumentation_service
+import project.getDocumentation_service
+import project.reloadDocumentation_service
+from fastapi import APIRouter, Depends
+
+router = APIRouter()
+
+
+@router.get(
+    "/api/docs", response_model=project.getDocumentation_service.ApiDocsResponseModel
+)
+async def api_get_getDocumentation(
+    request: project.getDocumentation_service.ApiDocsRequestModel = Depends(),
+) -> project.getDocumentation_service.ApiDocsResponseModel:
+    """
+    This endpoint provides documentation for the available API endpoints. Specifically, it explains the health check/hello world endpoint, detailing the path, method, expected response, and usage. This documentation aids users in understanding how to interact with the API.
+    """
+    res = await project.getDocumentation_service.getDocumentation(request)
+    return res
+
+
+@router.get(
+    "/api/documentation",
+    response_model=project.getAPIDocumentation_service.GetAPIDocumentationResponse,
+)
+async def api_get_getAPIDocumentation(
+    request: project.getAPIDocumentation_service.GetAPIDocumentationRequest = Depends(),
+) -> project.getAPIDocumentation_service.GetAPIDocumentationResponse:
+    """
+    Provides API documentation to the users. This route is used to fetch detailed API documentation, explaining how each endpoint works, their request and response formats, and expected behaviors. It interacts with the APIDocumentationModule. Expected response is a JSON object containing API documentation.
+    """
+    res = await project.getAPIDocumentation_service.getAPIDocumentation(request)
+    return res
+
+
+@router.post(
+    "/api/docs/reload",
+    response_model=project.reloadDocumentation_service.ReloadDocumentationResponse,
+    dependencies=[Depends(project.auth.require_admin)],
+)
+async def api_post_reloadDocumentation() -> (
+    project.reloadDocumentation_service.ReloadDocumentationResponse
+):
+    """
+    Rebuilds the documentation served by /api/docs and /api/documentation from the route table and the APIDocumentationModule table. Requires an Admin token.
+    """
+    res = await project.reloadDocumentation_service.reloadDocumentation()
+    return res
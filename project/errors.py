@@ -0,0 +1,61 @@
+from typing import Dict, Optional
+
+
+class DomainError(ValueError):
+    """
+    Base class for expected outcomes of an operation that the client has to handle, as opposed to faults of the service. The API answers them with `status_code`, `headers` and {"error": message}, without logging a traceback.
+    """
+
+    status_code = 400
+
+    def __init__(self, message: str = "", headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.headers = headers
+
+
+class InvalidRequestError(DomainError):
+    """
+    Raised when the arguments of an operation are well-formed but cannot be acted on, such as an unknown field or an out-of-range page size.
+    """
+
+    status_code = 422
+
+
+class AuthenticationError(DomainError):
+    """
+    Raised when credentials do not match a user.
+    """
+
+    status_code = 401
+
+
+class ForbiddenError(DomainError):
+    """
+    Raised when the caller is authenticated but not allowed to perform the operation.
+    """
+
+    status_code = 403
+
+
+class NotFoundError(DomainError):
+    """
+    Raised when the record an operation targets does not exist.
+    """
+
+    status_code = 404
+
+
+class ConflictError(DomainError):
+    """
+    Raised when a write conflicts with the current state of a record, such as a duplicate unique value or a stale version.
+    """
+
+    status_code = 409
+
+
+class RateLimitedError(DomainError):
+    """
+    Raised when the caller made too many attempts; the Retry-After header says when to try again.
+    """
+
+    status_code = 429
@@ -0,0 +1,155 @@
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import project.http_cache
+import project.serialization
+from pydantic import BaseModel
+
+FAST_PATH_ENABLED = os.environ.get("FAST_PATH_RESPONSES", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+class PrecomputedJSON:
+    """
+    A minimal ASGI endpoint for routes whose output depends only on cached state.
+
+    The encoded JSON body, Content-Length and a strong ETag are built once per content version and
+    then sent as-is, skipping routing, request validation, response_model validation and encoding.
+    Requests whose If-None-Match matches the ETag get a 304 without a body.
+
+    Args:
+        build (Callable[[], Optional[BaseModel]]): Builds the response model from the current cached
+            state, or returns None when there is nothing to serve and the route should answer instead.
+        version (Callable[[], Hashable]): Returns the version of the cached state the body derives from.
+        refresh (Optional[Callable[[], Awaitable[Any]]]): Called before each response so the backing
+            cache can load or schedule a refresh.
+        cache_control (Optional[str]): Cache-Control value sent with the response, if any.
+
+    Example:
+        hello = PrecomputedJSON(lambda: GetHelloResponse(message="hello world"))
+        if await hello.ready():
+            await hello(scope, receive, send)
+        > 200 b'{"message":"hello world"}'
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], Optional[BaseModel]],
+        version: Callable[[], Hashable] = lambda: 0,
+        refresh: Optional[Callable[[], Awaitable[Any]]] = None,
+        cache_control: Optional[str] = None,
+    ) -> None:
+        self._build = build
+        self._version = version
+        self._refresh = refresh
+        self.cache_control = cache_control
+        self._built_version: Optional[Hashable] = None
+        self._built = False
+        self.body: Optional[bytes] = b""
+        self.etag = ""
+        self.raw_headers: List[Tuple[bytes, bytes]] = []
+        self.not_modified_headers: List[Tuple[bytes, bytes]] = []
+
+    def prepare(self) -> bool:
+        """
+        Rebuilds the body and headers if the cached state changed since they were last built.
+
+        Returns:
+            bool: False if there is no precomputed response for the current state.
+        """
+        version = self._version()
+        if version == self._built_version and self._built:
+            return self.body is not None
+        self._built = True
+        self._built_version = version
+        model = self._build()
+        if model is None:
+            self.body = None
+            return False
+        body = model.model_dump_json().encode("utf-8")
+        etag = project.http_cache.etag_for(body)
+        self.not_modified_headers = project.http_cache.validator_headers(
+            etag, self.cache_control
+        )
+        if project.serialization.msgpack is not None:
+            # MessagePack requests for the same path are answered by the route stack. A 304 must
+            # vary like the 200, or a shared cache could revalidate one format with the other.
+            self.not_modified_headers.append((b"vary", b"Accept"))
+        self.raw_headers = [
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"content-type", b"application/json"),
+        ] + self.not_modified_headers
+        self.body = body
+        self.etag = etag
+        return True
+
+    async def ready(self) -> bool:
+        """
+        Lets the backing cache refresh, then prepares the response for the current state.
+
+        Returns:
+            bool: False if there is no precomputed response and the route should answer instead.
+        """
+        if self._refresh is not None:
+            await self._refresh()
+        return self.prepare()
+
+    async def __call__(self, scope, receive, send) -> None:
+        # Callers check ready() first.
+        if project.http_cache.etag_matches(
+            project.http_cache.request_header(scope, b"if-none-match"), self.etag
+        ):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": self.not_modified_headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": self.raw_headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": self.body})
+
+
+class FastPathMiddleware:
+    """
+    ASGI middleware that answers GET requests for registered paths from their PrecomputedJSON
+    endpoint and passes everything else, including requests the endpoint has no response for,
+    through to the application.
+
+    Args:
+        app: The wrapped ASGI application.
+        endpoints (Dict[str, PrecomputedJSON]): The precomputed endpoints, keyed by request path.
+    """
+
+    def __init__(self, app, endpoints: Dict[str, PrecomputedJSON]) -> None:
+        self.app = app
+        self.endpoints = endpoints
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            FAST_PATH_ENABLED
+            and scope["type"] == "http"
+            and scope["method"] == "GET"
+            and scope["path"] in self.endpoints
+        ):
+            endpoint = self.endpoints[scope["path"]]
+            if (
+                project.serialization.msgpack is None
+                or not project.serialization.accepts_msgpack(
+                    project.http_cache.request_header(scope, b"accept")
+                )
+            ) and await endpoint.ready():
+                await endpoint(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
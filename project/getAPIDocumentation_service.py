@@ -1,5 +1,6 @@
-import prisma
-import prisma.models
+from typing import List
+
+import project.docs_registry
 from pydantic import BaseModel
 
 
@@ -20,13 +21,14 @@ class GetAPIDocumentationResponse(BaseModel):
     title: str
     endpoint: str
     response: str
+    endpoints: List[project.docs_registry.EndpointDoc] = []
 
 
 async def getAPIDocumentation(
     request: GetAPIDocumentationRequest,
 ) -> GetAPIDocumentationResponse:
     """
-    Provides API documentation to the users. This route is used to fetch detailed API documentation, explaining how each endpoint works, their request and response formats, and expected behaviors. It interacts with the APIDocumentationModule. Expected response is a JSON object containing API documentation.
+    Provides API documentation to the users. This route is used to fetch detailed API documentation, explaining how each endpoint works, their request and response formats, and expected behaviors. It reads the APIDocumentationModule entry and the endpoint catalogue from the in-memory documentation registry, falling back to the default entry when the table is empty. Expected response is a JSON object containing API documentation.
 
     Args:
     request (GetAPIDocumentationRequest): Request model for fetching API documentation. Since this is a GET endpoint, no additional parameters are required.
@@ -38,15 +40,37 @@ async def getAPIDocumentation(
     request = GetAPIDocumentationRequest()
     res = await getAPIDocumentation(request)
     print(res)
-    > GetAPIDocumentationResponse(id=1, title="API Documentation", endpoint="/health-check", response="hello world")
+    > GetAPIDocumentationResponse(id=1, title="API Documentation", endpoint="/health-check", response="hello world", endpoints=[EndpointDoc(path='/api/docs', method='GET', ...), ...])
+    """
+    registry = await project.docs_registry.docs_registry.get()
+    return api_documentation_response(registry)
+
+
+def api_documentation_response(
+    registry: project.docs_registry.DocsRegistry,
+) -> GetAPIDocumentationResponse:
+    """
+    Builds the API documentation response from a built registry.
+
+    Args:
+    registry (project.docs_registry.DocsRegistry): The built documentation registry.
+
+    Returns:
+    GetAPIDocumentationResponse: The first APIDocumentationModule entry, or the default one (id 0), with the endpoint catalogue.
     """
-    documentation = await prisma.models.APIDocumentationModule.prisma().find_first()
-    if documentation:
+    if registry.rows:
+        documentation = registry.rows[0]
         return GetAPIDocumentationResponse(
             id=documentation.id,
             title=documentation.title,
             endpoint=documentation.endpoint,
             response=documentation.response,
+            endpoints=registry.endpoints,
         )
-    else:
-        raise ValueError("API Documentation not found")
+    return GetAPIDocumentationResponse(
+        id=0,
+        title="API Documentation",
+        endpoint="/health-check",
+        response="hello world",
+        endpoints=registry.endpoints,
+    )
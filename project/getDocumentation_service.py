@@ -1,5 +1,6 @@
-import prisma
-import prisma.models
+from typing import List
+
+import project.docs_registry
 from pydantic import BaseModel
 
 
@@ -13,7 +14,7 @@ class ApiDocsRequestModel(BaseModel):
 
 class ApiDocsResponseModel(BaseModel):
     """
-    Response model detailing the documentation of the health check endpoint. It includes the path, method, expected response, and a brief explanation.
+    Response model detailing the documentation of the health check endpoint. It includes the path, method, expected response, and a brief explanation, followed by the catalogue of every endpoint.
     """
 
     endpoint_path: str
@@ -21,38 +22,46 @@ class ApiDocsResponseModel(BaseModel):
     description: str
     expected_response: str
     example_usage: str
+    endpoints: List[project.docs_registry.EndpointDoc] = []
 
 
 async def getDocumentation(request: ApiDocsRequestModel) -> ApiDocsResponseModel:
     """
-    This endpoint provides documentation for the available API endpoints. Specifically, it explains the health check/hello world endpoint, detailing the path, method, expected response, and usage. This documentation aids users in understanding how to interact with the API.
+    This endpoint provides documentation for the available API endpoints. Specifically, it explains the health check/hello world endpoint, detailing the path, method, expected response, and usage, and lists every endpoint with its parameters, authentication and response model. This documentation aids users in understanding how to interact with the API. It is served from the in-memory documentation registry.
 
     Args:
         request (ApiDocsRequestModel): Since this is a GET endpoint for documentation, no input parameters are needed.
 
     Returns:
-        ApiDocsResponseModel: Response model detailing the documentation of the health check endpoint. It includes the path, method, expected response, and a brief explanation.
+        ApiDocsResponseModel: Response model detailing the documentation of the health check endpoint. It includes the path, method, expected response, and a brief explanation, followed by the catalogue of every endpoint.
 
     Example:
         request = ApiDocsRequestModel()
-        getDocumentation(request)
-        > ApiDocsResponseModel(endpoint_path="/health-check", http_method="GET", description="Health check endpoint", expected_response="hello world", example_usage="curl -X GET http://<host>/health-check")
+        await getDocumentation(request)
+        > ApiDocsResponseModel(endpoint_path="/health-check", http_method="GET", description="Health check endpoint", expected_response="hello world", example_usage="curl -X GET http://<host>/health-check", endpoints=[EndpointDoc(path='/api/docs', method='GET', ...), ...])
     """
-    doc_details = await prisma.models.APIDocumentationModule.prisma().find_first(
-        where={"endpoint": "/health-check"}
-    )
-    if not doc_details:
-        return ApiDocsResponseModel(
-            endpoint_path="/health-check",
-            http_method="GET",
-            description="Health check endpoint",
-            expected_response="hello world",
-            example_usage="curl -X GET http://<host>/health-check",
-        )
+    registry = await project.docs_registry.docs_registry.get()
+    return documentation_response(registry)
+
+
+def documentation_response(
+    registry: project.docs_registry.DocsRegistry,
+) -> ApiDocsResponseModel:
+    """
+    Builds the documentation response from a built registry. The health check endpoint's expected response comes from its APIDocumentationModule row when there is one.
+
+    Args:
+        registry (project.docs_registry.DocsRegistry): The built documentation registry.
+
+    Returns:
+        ApiDocsResponseModel: Response model detailing the documentation of the health check endpoint, followed by the catalogue of every endpoint.
+    """
+    doc_details = registry.override("/health-check")
     return ApiDocsResponseModel(
-        endpoint_path=doc_details.endpoint,
+        endpoint_path="/health-check",
         http_method="GET",
         description="Health check endpoint",
-        expected_response=doc_details.response,
-        example_usage=f"curl -X GET http://<host>{doc_details.endpoint}",
+        expected_response=doc_details.response if doc_details else "hello world",
+        example_usage="curl -X GET http://<host>/health-check",
+        endpoints=registry.endpoints,
     )
@@ -1,5 +1,4 @@
-import prisma
-import prisma.models
+import project.health_cache
 from pydantic import BaseModel
 
 
@@ -34,7 +33,6 @@ async def getHelloWorld(request: GetHelloRequest) -> GetHelloResponse:
         response = await getHelloWorld(request)
         assert response.message == "hello world"
     """
-    health_check_module = await prisma.models.HealthCheckModule.prisma().find_first()
-    message = health_check_module.content if health_check_module else "hello world"
+    message = await project.health_cache.health_cache.get_message()
     response = GetHelloResponse(message=message)
     return response
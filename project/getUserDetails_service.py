@@ -1,5 +1,5 @@
-import prisma
-import prisma.models
+import project.errors
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -11,6 +11,7 @@ class GetUserResponse(BaseModel):
     id: int
     email: str
     role: str
+    version: int
 
 
 async def getUserDetails(userId: int) -> GetUserResponse:
@@ -25,9 +26,11 @@ async def getUserDetails(userId: int) -> GetUserResponse:
 
     Example:
       userDetails = await getUserDetails(1)
-      # GetUserResponse(id=1, email='john.doe@example.com', role='Admin')
+      # GetUserResponse(id=1, email='john.doe@example.com', role='Admin', version=0)
     """
-    user = await prisma.models.User.prisma().find_unique(where={"id": userId})
+    user = await project.user_cache.user_cache.get_by_id(userId)
     if not user:
-        raise ValueError(f"User with ID {userId} not found")
-    return GetUserResponse(id=user.id, email=user.email, role=user.role)
+        raise project.errors.NotFoundError(f"User with ID {userId} not found")
+    return GetUserResponse(
+        id=user.id, email=user.email, role=user.role, version=user.version
+    )
@@ -1,5 +1,5 @@
-import prisma
-import prisma.models
+import project.errors
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -11,6 +11,7 @@ class GetUserResponseModel(BaseModel):
     id: int
     email: str
     role: str
+    version: int
 
 
 async def getUser(id: int) -> GetUserResponseModel:
@@ -25,9 +26,11 @@ async def getUser(id: int) -> GetUserResponseModel:
 
     Example:
         user = await getUser(1)
-        > GetUserResponseModel(id=1, email='example@example.com', role='User')
+        > GetUserResponseModel(id=1, email='example@example.com', role='User', version=0)
     """
-    user = await prisma.models.User.prisma().find_unique(where={"id": id})
+    user = await project.user_cache.user_cache.get_by_id(id)
     if user is None:
-        raise ValueError(f"User with ID {id} not found")
-    return GetUserResponseModel(id=user.id, email=user.email, role=user.role)
+        raise project.errors.NotFoundError(f"User with ID {id} not found")
+    return GetUserResponseModel(
+        id=user.id, email=user.email, role=user.role, version=user.version
+    )
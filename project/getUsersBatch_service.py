@@ -0,0 +1,72 @@
+from typing import List
+
+import project.errors
+import project.getUserDetails_service
+import project.user_cache
+from pydantic import BaseModel
+
+MAX_BATCH_IDS = 100
+
+
+class GetUsersBatchResponse(BaseModel):
+    """
+    The profiles of the requested users that exist, in request order, and the requested ids that match no user.
+    """
+
+    users: List[project.getUserDetails_service.GetUserResponse]
+    missing: List[int]
+
+
+def parse_ids(ids: str) -> List[int]:
+    """
+    Parses a comma-separated list of user ids, dropping duplicates but keeping their order.
+
+    Args:
+        ids (str): The ids, e.g. "1,2,3".
+
+    Returns:
+        List[int]: The distinct ids.
+
+    Example:
+        parse_ids("3,1,3")
+        > [3, 1]
+    """
+    try:
+        parsed = [int(id) for id in ids.split(",") if id.strip()]
+    except ValueError:
+        raise project.errors.InvalidRequestError(
+            "ids must be a comma-separated list of integers"
+        )
+    parsed = list(dict.fromkeys(parsed))
+    if not 1 <= len(parsed) <= MAX_BATCH_IDS:
+        raise project.errors.InvalidRequestError(
+            f"Between 1 and {MAX_BATCH_IDS} ids must be requested"
+        )
+    return parsed
+
+
+async def getUsersBatch(ids: List[int]) -> GetUsersBatchResponse:
+    """
+    Fetches the profiles of several users at once. Cached users are served from the user cache and the others are read with a single `WHERE id IN (...)` query, instead of one query per user.
+
+    Args:
+        ids (List[int]): The ids of the users to fetch, at most MAX_BATCH_IDS.
+
+    Returns:
+        GetUsersBatchResponse: The profiles of the requested users that exist, in request order, and the requested ids that match no user.
+
+    Example:
+        await getUsersBatch([1, 2, 404])
+        > GetUsersBatchResponse(users=[GetUserResponse(id=1, ...), GetUserResponse(id=2, ...)], missing=[404])
+    """
+    users = await project.user_cache.user_cache.get_many(ids)
+    return GetUsersBatchResponse(
+        users=[
+            project.getUserDetails_service.GetUserResponse(
+                id=user.id, email=user.email, role=user.role, version=user.version
+            )
+            for user in users
+            if user is not None
+        ],
+        missing=[id for id, user in zip(ids, users) if user is None],
+    )
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+import prisma
+import prisma.models
+import project.database
+import project.metrics
+import project.single_flight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MESSAGE = "hello world"
+
+HEALTH_CACHE_TTL_SECONDS = float(os.environ.get("HEALTH_CACHE_TTL_SECONDS", "30"))
+
+health_cache_hits = project.metrics.Counter(
+    "health_cache_hits_total", "HealthCheckModule content served from memory."
+)
+health_cache_misses = project.metrics.Counter(
+    "health_cache_misses_total",
+    "HealthCheckModule content lookups that had to wait for the database.",
+)
+health_cache_refreshes = project.metrics.Counter(
+    "health_cache_refreshes_total",
+    "HealthCheckModule content reloads, by outcome.",
+    ("outcome",),
+)
+
+
+class HealthContentCache:
+    """
+    In-process cache of the HealthCheckModule content served by the hello and health routes.
+
+    The content is loaded once at startup and then refreshed in the background whenever it is older
+    than the TTL, so callers never wait on the database unless the cache is empty or was invalidated.
+    If the table is empty or unreachable the cache falls back to the 'hello world' default.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = HEALTH_CACHE_TTL_SECONDS,
+        default: str = DEFAULT_MESSAGE,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.default = default
+        self._message: Optional[str] = None
+        self._loaded_at = 0.0
+        # Bumped whenever the cached content changes, so derived artifacts can be rebuilt.
+        self.version = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def current(self) -> str:
+        """
+        Returns the cached content without any I/O, or the default if nothing has been loaded yet.
+
+        Returns:
+            str: The cached HealthCheckModule content.
+        """
+        return self._message if self._message is not None else self.default
+
+    async def get_message(self) -> str:
+        """
+        Returns the HealthCheckModule content, loading it on a cold or invalidated cache and
+        scheduling a background refresh once the TTL has expired.
+
+        Returns:
+            str: The HealthCheckModule content, or the default message.
+
+        Example:
+            message = await health_cache.get_message()
+            > 'hello world'
+        """
+        message = self._message
+        if message is None:
+            health_cache_misses.inc()
+            return await self.load()
+        health_cache_hits.inc()
+        if time.monotonic() - self._loaded_at >= self.ttl_seconds:
+            self._schedule_refresh()
+        return message
+
+    @project.single_flight.coalesce("health_content")
+    async def load(self) -> str:
+        """
+        Reads the content from the database and stores it. Concurrent callers share one query.
+
+        Returns:
+            str: The freshly loaded content, or the default if the table is empty or unreachable.
+        """
+        async with self._lock:
+            # Another caller may have refreshed the cache while we were waiting for the lock.
+            if (
+                self._message is not None
+                and time.monotonic() - self._loaded_at < self.ttl_seconds
+            ):
+                return self._message
+            try:
+                module = await project.database.run_read(
+                    "health_content",
+                    lambda client: prisma.models.HealthCheckModule.prisma(
+                        client
+                    ).find_first(),
+                )
+            except Exception:
+                logger.warning(
+                    "Could not load HealthCheckModule content", exc_info=True
+                )
+                health_cache_refreshes.labels("error").inc()
+                # Keep serving the last known content (or the default) and retry after another TTL.
+                if self._message is None:
+                    self._store(self.default)
+                self._loaded_at = time.monotonic()
+                return self._message
+            self._store(module.content if module else self.default)
+            self._loaded_at = time.monotonic()
+            health_cache_refreshes.labels("success").inc()
+            return self._message
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached content so the next lookup reloads it from the database.
+        """
+        self._message = None
+        self._loaded_at = 0.0
+
+    def _store(self, message: str) -> None:
+        if message != self._message:
+            self.version += 1
+        self._message = message
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self.load())
+
+
+health_cache = HealthContentCache()
@@ -0,0 +1,36 @@
+import project.health_cache
+from pydantic import BaseModel
+
+
+class HealthCheckRequestModel(BaseModel):
+    """
+    Request model for the /health-check endpoint. It is a simple GET request without any parameters, so this model is empty.
+    """
+
+    pass
+
+
+class HealthCheckResponseModel(BaseModel):
+    """
+    Response model for the /health-check endpoint. It returns the 'hello world' message indicating the app is running.
+    """
+
+    message: str
+
+
+def health_check(request: HealthCheckRequestModel) -> HealthCheckResponseModel:
+    """
+    Returns the 'hello world' health message. The message is read from the in-process HealthCheckModule cache, so this endpoint never touches the database.
+
+    Args:
+        request (HealthCheckRequestModel): Request model for the /health-check endpoint. It is a simple GET request without any parameters, so this model is empty.
+
+    Returns:
+        HealthCheckResponseModel: Response model for the /health-check endpoint. It returns the 'hello world' message indicating the app is running.
+
+    Example:
+        request = HealthCheckRequestModel()
+        response = health_check(request)
+        > HealthCheckResponseModel(message='hello world')
+    """
+    return HealthCheckResponseModel(message=project.health_cache.health_cache.current())
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+import project.database
+import project.metrics
+import project.worker_pool
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE_INTERVAL_SECONDS = float(
+    os.environ.get("HEALTH_PROBE_INTERVAL_SECONDS", "5")
+)
+
+HEALTH_PROBE_TIMEOUT_SECONDS = float(
+    os.environ.get("HEALTH_PROBE_TIMEOUT_SECONDS", "2")
+)
+
+READY_MAX_LOOP_LAG_SECONDS = float(os.environ.get("READY_MAX_LOOP_LAG_SECONDS", "0.5"))
+
+READY_MAX_POOL_WAITING = int(os.environ.get("READY_MAX_POOL_WAITING", "10"))
+
+health_probe_runs = project.metrics.Counter(
+    "health_probe_runs_total", "Dependency probe rounds, by outcome.", ("outcome",)
+)
+health_probe_ready = project.metrics.Gauge(
+    "health_probe_ready", "1 if the last probe round found the instance ready."
+)
+
+
+class CheckResult(BaseModel):
+    """
+    The outcome of one dependency check. Non-critical checks only degrade the status.
+    """
+
+    ok: bool
+    critical: bool
+    detail: str
+
+
+class HealthSnapshot(BaseModel):
+    """
+    The result of the last probe round, served as-is by the readiness endpoint.
+    """
+
+    status: str
+    ready: bool
+    checked_at: float
+    checks: Dict[str, CheckResult]
+
+
+class HealthProber:
+    """
+    Probes the database, the database pool, the hash worker pool and event-loop lag on an interval
+    in the background, and keeps the latest result (and its encoded JSON body) as a snapshot.
+    Readiness probes only read the snapshot, so their cost doesn't depend on how often they come.
+
+    Args:
+        interval_seconds (float): Time between probe rounds.
+        timeout_seconds (float): How long the database ping may take.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = HEALTH_PROBE_INTERVAL_SECONDS,
+        timeout_seconds: float = HEALTH_PROBE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.snapshot = HealthSnapshot(
+            status="starting", ready=False, checked_at=0.0, checks={}
+        )
+        self.body = self.snapshot.model_dump_json().encode("utf-8")
+        self._loop_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def probe(self) -> HealthSnapshot:
+        """
+        Runs one probe round and stores its result as the current snapshot.
+
+        Returns:
+            HealthSnapshot: The new snapshot.
+
+        Example:
+            await health_prober.probe()
+            > HealthSnapshot(status='ok', ready=True, checked_at=1718000000.0, checks={'database': CheckResult(ok=True, critical=True, detail='ping 1.2 ms'), ...})
+        """
+        checks = {
+            "database": await self._check_database(),
+            "database_pool": await self._check_database_pool(),
+            "event_loop": CheckResult(
+                ok=self._loop_lag <= READY_MAX_LOOP_LAG_SECONDS,
+                critical=True,
+                detail=f"lag {self._loop_lag * 1000:.1f} ms",
+            ),
+            "hash_pool": self._check_hash_pool(),
+        }
+        if project.database.replica_client is not None:
+            # Reads fall back to the primary while the replica is out, so it only degrades.
+            checks["database_replica"] = CheckResult(
+                ok=project.database.db_replica_healthy.value() == 1,
+                critical=False,
+                detail=f"lag {project.database.db_replica_lag_seconds.value():.3f} s",
+            )
+        ready = all(check.ok for check in checks.values() if check.critical)
+        if not ready:
+            status = "unavailable"
+        elif all(check.ok for check in checks.values()):
+            status = "ok"
+        else:
+            status = "degraded"
+        self.snapshot = HealthSnapshot(
+            status=status, ready=ready, checked_at=time.time(), checks=checks
+        )
+        self.body = self.snapshot.model_dump_json().encode("utf-8")
+        health_probe_runs.labels(status).inc()
+        health_probe_ready.set(1 if ready else 0)
+        return self.snapshot
+
+    async def _check_database(self) -> CheckResult:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                project.database.db_client.query_raw("SELECT 1 AS ok"),
+                self.timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            return CheckResult(
+                ok=False,
+                critical=True,
+                detail=f"ping timed out after {self.timeout_seconds:g} s",
+            )
+        except Exception as e:
+            return CheckResult(ok=False, critical=True, detail=f"ping failed: {e}")
+        return CheckResult(
+            ok=True,
+            critical=True,
+            detail=f"ping {(time.perf_counter() - start) * 1000:.1f} ms",
+        )
+
+    async def _check_database_pool(self) -> CheckResult:
+        try:
+            await asyncio.wait_for(
+                project.database.collect_pool_metrics(project.database.db_client),
+                self.timeout_seconds,
+            )
+        except Exception:
+            # The engine metrics are optional; report the last collected values.
+            logger.debug("Could not refresh database pool metrics", exc_info=True)
+        waiting = project.database.db_pool_waiting_queries.value()
+        busy = project.database.db_pool_connections.value("busy")
+        total = project.database.db_pool_connections.value("open")
+        return CheckResult(
+            ok=waiting <= READY_MAX_POOL_WAITING,
+            critical=True,
+            detail=f"{busy:g}/{total:g} connections busy, {waiting:g} queries waiting",
+        )
+
+    def _check_hash_pool(self) -> CheckResult:
+        pool = project.worker_pool.hash_pool
+        return CheckResult(
+            ok=pool.queue_depth < pool.max_queue,
+            critical=False,
+            detail=f"{pool.queue_depth}/{pool.max_queue} jobs queued",
+        )
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await self.probe()
+            except Exception:
+                logger.exception("Health probe failed")
+            # How late the loop wakes us up after the interval is its scheduling lag.
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            self._loop_lag = max(loop.time() - expected, 0.0)
+
+    def start(self) -> None:
+        """
+        Starts probing in the background.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        """
+        Stops probing.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+health_prober = HealthProber()
@@ -0,0 +1,145 @@
+import hashlib
+import os
+from typing import Dict, List, Optional, Tuple
+
+CACHE_CONTROL_HELLO = os.environ.get(
+    "CACHE_CONTROL_HELLO", "public, max-age=60, stale-while-revalidate=300"
+)
+
+CACHE_CONTROL_DOCS = os.environ.get(
+    "CACHE_CONTROL_DOCS", "public, max-age=300, stale-while-revalidate=3600"
+)
+
+
+def etag_for(body: bytes) -> str:
+    """
+    Returns a strong ETag derived from the content of a response body.
+
+    Args:
+        body (bytes): The encoded response body.
+
+    Returns:
+        str: The quoted entity tag.
+
+    Example:
+        etag_for(b'{"message":"hello world"}')
+        > '"5b1ff1f8b2d6b5a8c3e0bd1a8b5c0f1e"'
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def request_header(scope, name: bytes) -> Optional[bytes]:
+    """
+    Returns the first value of a request header from an ASGI scope, or None.
+    """
+    for key, value in scope["headers"]:
+        if key == name:
+            return value
+    return None
+
+
+def etag_matches(if_none_match: Optional[bytes], etag: str) -> bool:
+    """
+    Tells whether an If-None-Match header matches an ETag, using the weak comparison that
+    conditional GET requires (a W/ prefix is ignored).
+
+    Args:
+        if_none_match (Optional[bytes]): The raw If-None-Match request header, if any.
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current and a 304 may be sent.
+
+    Example:
+        etag_matches(b'W/"abc", "def"', '"abc"')
+        > True
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.decode("latin-1").split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def validator_headers(
+    etag: str, cache_control: Optional[str]
+) -> List[Tuple[bytes, bytes]]:
+    """
+    Returns the ETag and Cache-Control headers sent with both 200 and 304 responses.
+    """
+    headers = [(b"etag", etag.encode("latin-1"))]
+    if cache_control:
+        headers.append((b"cache-control", cache_control.encode("latin-1")))
+    return headers
+
+
+class ConditionalGetMiddleware:
+    """
+    ASGI middleware that adds an ETag and a Cache-Control policy to successful GET responses of the
+    given paths, and answers requests whose If-None-Match matches the ETag with 304 Not Modified.
+
+    The response is buffered to hash it, so it is meant for small, rarely changing documents served
+    by the route stack; precomputed fast-path responses handle conditional requests themselves.
+
+    Args:
+        app: The wrapped ASGI application.
+        policies (Dict[str, Optional[str]]): The Cache-Control value for each path, or None to only
+            add an ETag.
+    """
+
+    def __init__(self, app, policies: Dict[str, Optional[str]]) -> None:
+        self.app = app
+        self.policies = policies
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.policies
+        ):
+            await self.app(scope, receive, send)
+            return
+        cache_control = self.policies[scope["path"]]
+        start = None
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                start = message
+                return
+            if start is None:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            headers = [
+                (key, value)
+                for key, value in start["headers"]
+                if key not in (b"etag", b"cache-control")
+            ]
+            etag = etag_for(body)
+            if etag_matches(request_header(scope, b"if-none-match"), etag):
+                # The 304 varies like the 200 would, so shared caches keep the formats apart.
+                vary = [(key, value) for key, value in headers if key == b"vary"]
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 304,
+                        "headers": validator_headers(etag, cache_control) + vary,
+                    }
+                )
+                await send({"type": "http.response.body", "body": b""})
+                return
+            headers += validator_headers(etag, cache_control)
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
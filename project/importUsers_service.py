@@ -0,0 +1,221 @@
+import asyncio
+import codecs
+import csv
+import json
+import os
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import prisma
+import prisma.models
+import project.database
+import project.password_hashing
+import project.worker_pool
+from pydantic import BaseModel
+
+BULK_IMPORT_BATCH_SIZE = int(os.environ.get("BULK_IMPORT_BATCH_SIZE", "500"))
+
+# Imports hash on at most this share of the hash workers, leaving the rest to logins.
+BULK_IMPORT_HASH_SHARE = float(os.environ.get("BULK_IMPORT_HASH_SHARE", "0.5"))
+
+BULK_IMPORT_HASH_RETRIES = int(os.environ.get("BULK_IMPORT_HASH_RETRIES", "6"))
+
+ROLES = ("Admin", "User")
+
+
+class ImportRowError(BaseModel):
+    """
+    Describes a row that could not be imported.
+    """
+
+    line: int
+    email: Optional[str]
+    error: str
+
+
+class ImportUsersResponse(BaseModel):
+    """
+    Response model for a bulk user import. It reports how many users were created and why the other rows were rejected.
+    """
+
+    created: int
+    failed: int
+    errors: List[ImportRowError]
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _iter_records(
+    chunks: AsyncIterator[bytes], content_type: str
+) -> AsyncIterator[Tuple[int, Optional[Dict[str, str]], Optional[str]]]:
+    """
+    Yields (line number, record, parse error) for every non-empty line of an NDJSON or CSV body.
+    CSV bodies must start with a header row naming the email, password and (optional) role columns;
+    quoted fields may not contain newlines.
+    """
+    header: Optional[List[str]] = None
+    line_number = 0
+    async for line in _iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        if content_type == "text/csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip().lower() for name in values]
+                continue
+            if len(values) != len(header):
+                yield line_number, None, f"Expected {len(header)} columns"
+                continue
+            yield line_number, dict(zip(header, values)), None
+        else:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "Expected a JSON object"
+                continue
+            yield line_number, record, None
+
+
+async def _insert_batch(
+    batch: List[Tuple[int, str, str, str]], semaphore: asyncio.Semaphore
+) -> Tuple[int, List[ImportRowError]]:
+    errors = []
+    emails = [email for _, email, _, _ in batch]
+    existing = await prisma.models.User.prisma().find_many(
+        where={"email": {"in": emails}}
+    )
+    taken = {user.email for user in existing}
+    rows = []
+    for line, email, password, role in batch:
+        if email in taken:
+            errors.append(
+                ImportRowError(line=line, email=email, error="Email already exists")
+            )
+        else:
+            rows.append((line, email, password, role))
+
+    async def hash_row(password: str) -> Optional[str]:
+        async with semaphore:
+            for attempt in range(BULK_IMPORT_HASH_RETRIES + 1):
+                try:
+                    return await project.password_hashing.hash_password(password)
+                except project.worker_pool.PoolSaturatedError as e:
+                    if attempt == BULK_IMPORT_HASH_RETRIES:
+                        return None
+                    # The queue is full of logins: wait for it to drain rather than fail the import.
+                    await asyncio.sleep(min(0.05 * 2**attempt, e.retry_after))
+        return None
+
+    results = await asyncio.gather(*(hash_row(password) for _, _, password, _ in rows))
+    hashed_rows = [(row, hashed) for row, hashed in zip(rows, results) if hashed]
+    for (line, email, _, _), hashed in zip(rows, results):
+        if hashed is None:
+            errors.append(
+                ImportRowError(
+                    line=line,
+                    email=email,
+                    error="Password hashing is overloaded, retry this row later",
+                )
+            )
+    rows = [row for row, _ in hashed_rows]
+    hashes = [hashed for _, hashed in hashed_rows]
+    created = 0
+    if rows:
+        created = await prisma.models.User.prisma().create_many(
+            data=[
+                {"email": email, "password": hashed, "role": role}
+                for (_, email, _, role), hashed in zip(rows, hashes)
+            ],
+            skip_duplicates=True,
+        )
+        project.database.pin_to_primary(*(f"email:{email}" for _, email, _, _ in rows))
+    if created < len(rows):
+        # Another writer inserted some of these emails between our check and the insert. Our rows
+        # are the ones stored with our (salted, so unique) password hash.
+        inserted = await prisma.models.User.prisma().find_many(
+            where={"email": {"in": [email for _, email, _, _ in rows]}}
+        )
+        stored = {user.email: user.password for user in inserted}
+        for (line, email, _, _), hashed in zip(rows, hashes):
+            if stored.get(email) != hashed:
+                errors.append(
+                    ImportRowError(line=line, email=email, error="Email already exists")
+                )
+    errors.sort(key=lambda error: error.line)
+    return created, errors
+
+
+async def importUsers(
+    chunks: AsyncIterator[bytes], content_type: str
+) -> ImportUsersResponse:
+    """
+    Creates users in bulk from a streamed NDJSON or CSV body. Rows are validated as they arrive, passwords are hashed in parallel on a share of the hash worker pool (rows whose hash keeps being shed by a saturated pool are reported, not fatal), and rows are inserted in batches with create_many, so the whole body is never held in memory.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The request body as it is received.
+        content_type (str): Either 'application/x-ndjson' or 'text/csv'.
+
+    Returns:
+        ImportUsersResponse: Response model for a bulk user import. It reports how many users were created and why the other rows were rejected.
+
+    Example:
+        # body: {"email": "a@example.com", "password": "secret"}
+        #       {"email": "b@example.com"}
+        await importUsers(request.stream(), "application/x-ndjson")
+        > ImportUsersResponse(created=1, failed=1, errors=[ImportRowError(line=2, email='b@example.com', error='Missing password')])
+    """
+    semaphore = asyncio.Semaphore(
+        max(int(project.worker_pool.hash_pool.max_workers * BULK_IMPORT_HASH_SHARE), 1)
+    )
+    errors: List[ImportRowError] = []
+    seen = set()
+    batch: List[Tuple[int, str, str, str]] = []
+    created = 0
+    rows = 0
+    async for line, record, parse_error in _iter_records(chunks, content_type):
+        rows += 1
+        if record is None:
+            errors.append(ImportRowError(line=line, email=None, error=parse_error))
+            continue
+        email = str(record.get("email") or "").strip()
+        password = str(record.get("password") or "")
+        role = str(record.get("role") or "User")
+        if not email:
+            error = "Missing email"
+        elif not password:
+            error = "Missing password"
+        elif role not in ROLES:
+            error = f"Unknown role {role}"
+        elif email in seen:
+            error = "Duplicate email in import"
+        else:
+            error = None
+        if error:
+            errors.append(ImportRowError(line=line, email=email or None, error=error))
+            continue
+        seen.add(email)
+        batch.append((line, email, password, role))
+        if len(batch) >= BULK_IMPORT_BATCH_SIZE:
+            batch_created, batch_errors = await _insert_batch(batch, semaphore)
+            created += batch_created
+            errors.extend(batch_errors)
+            batch = []
+    if batch:
+        batch_created, batch_errors = await _insert_batch(batch, semaphore)
+        created += batch_created
+        errors.extend(batch_errors)
+    return ImportUsersResponse(created=created, failed=rows - created, errors=errors)
@@ -0,0 +1,142 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+import project.http_cache
+import project.logging_setup
+import project.metrics
+
+http_requests = project.metrics.Counter(
+    "http_requests_total",
+    "Requests handled, by method, route and status.",
+    ("method", "route", "status"),
+)
+http_request_errors = project.metrics.Counter(
+    "http_request_errors_total",
+    "Requests that failed with a 5xx status or an unhandled exception, by method and route.",
+    ("method", "route"),
+)
+http_request_duration_seconds = project.metrics.Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response, by method and route.",
+    ("method", "route"),
+)
+http_request_db_seconds = project.metrics.Histogram(
+    "http_request_db_seconds",
+    "Time spent waiting on Prisma queries by requests that issued any, by method and route.",
+    ("method", "route"),
+)
+
+_db_seconds: ContextVar[Optional[List[float]]] = ContextVar("db_seconds", default=None)
+
+
+def record_db_time(seconds: float) -> None:
+    """
+    Adds the duration of a database query to the request being handled, if any.
+
+    Args:
+        seconds (float): How long the query took.
+    """
+    spent = _db_seconds.get()
+    if spent is not None:
+        spent[0] += seconds
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI middleware that counts requests and errors and records request latency and database time
+    per method and route template (e.g. /api/users/{userId}), including requests answered by the
+    fast path. Requests that match no route are recorded under the route "unmatched".
+
+    It also binds the request (its X-Request-ID, which is echoed in the response, and start time)
+    to the log records emitted while it is handled.
+
+    It should wrap every other middleware, so it is added last.
+
+    Args:
+        app: The wrapped ASGI application.
+        routes (List[Any]): The application's route table, e.g. `app.routes`.
+    """
+
+    def __init__(self, app, routes: List[Any]) -> None:
+        self.app = app
+        self.routes = routes
+        self._static_paths: Dict[str, str] = {}
+        self._indexed_routes = -1
+        self._endpoint_paths: Dict[Any, str] = {}
+        self._children: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        self._counters: Dict[Tuple[str, str, int], Any] = {}
+
+    def _index_routes(self) -> None:
+        static_paths = {}
+        for route in self.routes:
+            path = getattr(route, "path", None)
+            if path is None:
+                continue
+            if "{" not in path:
+                static_paths[path] = path
+            endpoint = getattr(route, "endpoint", None)
+            if endpoint is not None:
+                self._endpoint_paths[endpoint] = path
+        self._static_paths = static_paths
+        self._indexed_routes = len(self.routes)
+
+    def _route(self, scope) -> str:
+        # Routes can be added after startup (see project.lazy_routes).
+        if len(self.routes) != self._indexed_routes:
+            self._index_routes()
+        route = self._static_paths.get(scope["path"])
+        if route is None:
+            route = self._endpoint_paths.get(scope.get("endpoint"), "unmatched")
+        return route
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        request_id = project.http_cache.request_header(scope, b"x-request-id")
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if request_id:
+                    message["headers"] = list(message["headers"]) + [
+                        (b"x-request-id", request_id)
+                    ]
+            await send(message)
+
+        spent = [0.0]
+        token = _db_seconds.set(spent)
+        start = time.perf_counter()
+        context_token = project.logging_setup.request_context.set(
+            [request_id.decode("latin-1") if request_id else None, scope, start]
+        )
+        try:
+            await self.app(scope, receive, send_wrapper)
+            project.logging_setup.request_context.reset(context_token)
+            # On errors the context stays bound: Starlette's outermost middleware logs them after
+            # this returns, and every request runs in a task of its own.
+        finally:
+            elapsed = time.perf_counter() - start
+            _db_seconds.reset(token)
+            method = scope["method"]
+            route = self._route(scope)
+            children = self._children.get((method, route))
+            if children is None:
+                children = self._children[(method, route)] = (
+                    http_request_duration_seconds.labels(method, route),
+                    http_request_db_seconds.labels(method, route),
+                )
+            children[0].observe(elapsed)
+            if spent[0]:
+                children[1].observe(spent[0])
+            counter = self._counters.get((method, route, status))
+            if counter is None:
+                counter = self._counters[(method, route, status)] = (
+                    http_requests.labels(method, route, str(status))
+                )
+            counter.inc()
+            if status >= 500:
+                http_request_errors.labels(method, route).inc()
@@ -0,0 +1,95 @@
+import importlib
+import logging
+import os
+import time
+from typing import Dict, Sequence, Set
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+LAZY_ROUTES_ENABLED = os.environ.get("LAZY_ROUTES", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Requests that need the complete route table, including the documentation built from it.
+SCHEMA_PATHS = (
+    "/openapi.json",
+    "/docs",
+    "/docs/oauth2-redirect",
+    "/redoc",
+    "/api/docs",
+    "/api/documentation",
+    "/api/docs/reload",
+)
+
+
+def include_first(app: FastAPI, spec: str) -> None:
+    """
+    Imports an APIRouter given as "module:attribute" and adds its routes in front of the app's
+    existing routes, so they win over catch-all templates such as /api/users/{userId}.
+
+    Args:
+        app (FastAPI): The application to add the routes to.
+        spec (str): Where the router lives, e.g. "project.docs_routes:router".
+
+    Example:
+        include_first(app, "project.bulk_routes:router")
+    """
+    module, attribute = spec.split(":")
+    router = getattr(importlib.import_module(module), attribute)
+    routes = app.router.routes
+    count = len(routes)
+    app.include_router(router)
+    added = routes[count:]
+    del routes[count:]
+    routes[0:0] = added
+    # The cached OpenAPI schema doesn't list the new routes yet.
+    app.openapi_schema = None
+
+
+class LazyRoutesMiddleware:
+    """
+    ASGI middleware that defers importing and registering rarely used routers until the first
+    request for one of their paths, or for the OpenAPI schema or docs, arrives. This keeps their
+    service modules and FastAPI's per-route setup off the cold-start path.
+
+    Args:
+        app: The wrapped ASGI application.
+        target (FastAPI): The application the routers are added to.
+        routers (Dict[str, Sequence[str]]): The paths served by each router, keyed by "module:attribute".
+    """
+
+    def __init__(self, app, target: FastAPI, routers: Dict[str, Sequence[str]]) -> None:
+        self.app = app
+        self.target = target
+        self._specs_by_path: Dict[str, str] = {
+            path: spec for spec, paths in routers.items() for path in paths
+        }
+        self._pending: Set[str] = set(routers)
+
+    def _load(self, spec: str) -> None:
+        if spec not in self._pending:
+            return
+        start = time.perf_counter()
+        include_first(self.target, spec)
+        self._pending.discard(spec)
+        logger.info(
+            "Loaded routes from %s in %.1f ms",
+            spec,
+            (time.perf_counter() - start) * 1000,
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self._pending and scope["type"] == "http":
+            path = scope["path"]
+            if path in SCHEMA_PATHS:
+                for spec in list(self._pending):
+                    self._load(spec)
+            else:
+                spec = self._specs_by_path.get(path)
+                if spec is not None:
+                    self._load(spec)
+        await self.app(scope, receive, send)
@@ -0,0 +1,100 @@
+from enum import Enum
+from typing import List, Optional
+
+import prisma
+import project.errors
+from pydantic import BaseModel
+
+LIST_FIELDS = ("id", "email", "role", "version")
+
+MAX_PAGE_SIZE = 500
+
+
+class Role(Enum):
+    """
+    Enum representing user roles.
+    """
+
+    Admin = "Admin"
+    User = "User"
+
+
+class UserListItem(BaseModel):
+    """
+    A user in a listing page. Only the requested fields are set; id is always included because it is the cursor.
+    """
+
+    id: int
+    email: Optional[str] = None
+    role: Optional[str] = None
+    version: Optional[int] = None
+
+
+class ListUsersResponse(BaseModel):
+    """
+    Response model for a page of users. Pass next_cursor as `after` to fetch the next page; it is null on the last page.
+    """
+
+    users: List[UserListItem]
+    next_cursor: Optional[int]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def listUsers(
+    after: Optional[int] = None,
+    limit: int = 50,
+    role: Optional[Role] = None,
+    email_prefix: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+) -> ListUsersResponse:
+    """
+    Lists users ordered by id using keyset pagination (`id > after ORDER BY id LIMIT limit`), so every page costs the same however deep into the table it is. Filters on role (served by the (role, id) index) and email prefix (served by the trigram index on email). Only the requested columns are read from the database; the password column is never selected.
+
+    Args:
+        after (Optional[int]): Return users with an id greater than this cursor.
+        limit (int): The page size, between 1 and MAX_PAGE_SIZE.
+        role (Optional[Role]): Only return users with this role (Admin/User).
+        email_prefix (Optional[str]): Only return users whose email starts with this prefix.
+        fields (Optional[List[str]]): The fields to return, out of id, email, role and version. Defaults to all of them.
+
+    Returns:
+        ListUsersResponse: Response model for a page of users. Pass next_cursor as `after` to fetch the next page; it is null on the last page.
+
+    Example:
+        await listUsers(after=0, limit=2, role=Role.User, fields=["id", "email"])
+        > ListUsersResponse(users=[UserListItem(id=3, email='a@example.com'), UserListItem(id=7, email='b@example.com')], next_cursor=7)
+    """
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise project.errors.InvalidRequestError(
+            f"limit must be between 1 and {MAX_PAGE_SIZE}"
+        )
+    columns = ["id"]
+    for field in fields or LIST_FIELDS:
+        if field not in LIST_FIELDS:
+            raise project.errors.InvalidRequestError(f"Unknown field {field}")
+        if field not in columns:
+            columns.append(field)
+    # Column names come from the LIST_FIELDS whitelist; every value is a bound parameter.
+    conditions = ["id > $1"]
+    args: list = [after or 0]
+    if role is not None:
+        args.append(role.value)
+        conditions.append(f'role = ${len(args)}::"Role"')
+    if email_prefix:
+        args.append(_escape_like(email_prefix) + "%")
+        conditions.append(f"email LIKE ${len(args)}")
+    args.append(limit + 1)
+    query = (
+        f"SELECT {', '.join(columns)} FROM users"
+        f" WHERE {' AND '.join(conditions)}"
+        f" ORDER BY id LIMIT ${len(args)}"
+    )
+    rows = await prisma.get_client().query_raw(query, *args)
+    has_more = len(rows) > limit
+    users = [UserListItem(**row) for row in rows[:limit]]
+    return ListUsersResponse(
+        users=users, next_cursor=users[-1].id if has_more else None
+    )
@@ -0,0 +1,221 @@
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+import traceback
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+import project.loop_monitor
+import project.metrics
+import project.serialization
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+
+LOG_TRACEBACK_SAMPLE_SECONDS = float(
+    os.environ.get("LOG_TRACEBACK_SAMPLE_SECONDS", "60")
+)
+
+log_records_dropped = project.metrics.Counter(
+    "log_records_dropped_total",
+    "Log records discarded because the logging queue was full.",
+)
+log_records_suppressed = project.metrics.Counter(
+    "log_records_suppressed_total",
+    "Log records with a traceback already logged in the current sampling window.",
+)
+
+# The request being handled: [request id or None until one is needed, ASGI scope, perf_counter
+# at arrival].
+request_context: ContextVar[Optional[List[Any]]] = ContextVar(
+    "request_context", default=None
+)
+
+_request_ids = itertools.count(1)
+_REQUEST_ID_PREFIX = f"{os.getpid():x}-"
+
+# The server's loggers have handlers of their own that write synchronously, and don't propagate.
+# Among them is the "Exception in ASGI application" traceback logged for every 500.
+SERVER_LOGGERS = (
+    "uvicorn",
+    "uvicorn.error",
+    "uvicorn.access",
+    "gunicorn.error",
+    "gunicorn.access",
+)
+
+# Attributes every LogRecord has; anything else was passed with `extra=`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def new_request_id() -> str:
+    """
+    Returns a request id unique within the process, for requests that don't carry X-Request-ID.
+    """
+    return _REQUEST_ID_PREFIX + format(next(_request_ids), "x")
+
+
+class TracebackSampler(logging.Filter):
+    """
+    Collapses floods of identical errors: within a window, only the first record with a given
+    exception type raised from a given line is let through. The next one after the window reports
+    how many were suppressed in its `repeated` field.
+
+    Args:
+        window_seconds (float): The sampling window; 0 lets every record through.
+    """
+
+    def __init__(self, window_seconds: float = LOG_TRACEBACK_SAMPLE_SECONDS) -> None:
+        super().__init__()
+        self.window_seconds = window_seconds
+        self._windows: Dict[Tuple[Any, ...], List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not record.exc_info or not self.window_seconds:
+            return True
+        exc_type, _, tb = record.exc_info
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        key = (
+            record.pathname,
+            record.lineno,
+            exc_type,
+            tb.tb_frame.f_code if tb is not None else None,
+            tb.tb_lineno if tb is not None else None,
+        )
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is not None and now - window[0] < self.window_seconds:
+            window[1] += 1
+            log_records_suppressed.inc()
+            return False
+        if window is not None and window[1]:
+            record.repeated = int(window[1])
+        if len(self._windows) > 10000:
+            self._windows.clear()
+        self._windows[key] = [now, 0]
+        return True
+
+
+class RequestQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a background thread without blocking: the caller only attaches the request
+    context and resolves the message, while formatting (including tracebacks) and writing happen on
+    the listener thread. When the queue is full the record is dropped and counted.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        context = request_context.get()
+        if context is not None:
+            request_id, scope, start = context
+            if request_id is None:
+                # Generated on the first record, so requests that log nothing don't pay for it.
+                request_id = context[0] = new_request_id()
+            record.request_id = request_id
+            record.method = scope.get("method")
+            record.route = project.loop_monitor.route_of(scope)
+            record.latency_ms = round((time.perf_counter() - start) * 1000, 3)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats records as one JSON object per line, with the request context, any `extra` fields and
+    the traceback of logged exceptions.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_type"] = record.exc_info[0].__name__
+            entry["traceback"] = "".join(traceback.format_exception(*record.exc_info))
+        elif record.stack_info:
+            entry["stack"] = record.stack_info
+        try:
+            return project.serialization.dumps(entry).decode("utf-8")
+        except TypeError:
+            return project.serialization.dumps(
+                {key: str(value) for key, value in entry.items()}
+            ).decode("utf-8")
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_previous_handlers: List[logging.Handler] = []
+_previous_server_loggers: Dict[str, Tuple[List[logging.Handler], bool]] = {}
+
+
+def start() -> None:
+    """
+    Routes the root logger, and the server's loggers (SERVER_LOGGERS), through a bounded queue to
+    a background thread that writes to stderr, as JSON lines (LOG_FORMAT=json) or plain text.
+    Call it in each worker process, after forking and after the server configured its logging.
+    """
+    global _listener, _previous_handlers
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(sys.stderr)
+    if LOG_FORMAT == "json":
+        output.setFormatter(JSONFormatter())
+    else:
+        output.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+    handler = RequestQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    handler.addFilter(TracebackSampler())
+    root = logging.getLogger()
+    _previous_handlers = root.handlers[:]
+    root.handlers = [handler]
+    root.setLevel(LOG_LEVEL)
+    for name in SERVER_LOGGERS:
+        server_logger = logging.getLogger(name)
+        _previous_server_loggers[name] = (
+            server_logger.handlers[:],
+            server_logger.propagate,
+        )
+        # Their records are also sampled and formatted like the app's.
+        server_logger.handlers = []
+        server_logger.propagate = True
+    _listener = logging.handlers.QueueListener(
+        handler.queue, output, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def stop() -> None:
+    """
+    Writes out the queued records and restores the previous handlers.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    logging.getLogger().handlers = _previous_handlers
+    for name, (handlers, propagate) in _previous_server_loggers.items():
+        server_logger = logging.getLogger(name)
+        server_logger.handlers = handlers
+        server_logger.propagate = propagate
+    _previous_server_loggers.clear()
@@ -1,7 +1,13 @@
+import logging
+import os
+import time
 from enum import Enum
 
-import bcrypt
 import jwt
+import project.database
+import project.errors
+import project.password_hashing
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -10,8 +16,8 @@ class Role(Enum):
     Enum representing user roles.
     """
 
-    Admin: str
-    User: str
+    Admin = "Admin"
+    User = "User"
 
 
 class UserDetails(BaseModel):
@@ -33,10 +39,14 @@ class LoginResponse(BaseModel):
     user: UserDetails
 
 
-SECRET_KEY = "your_jwt_secret_key"
+logger = logging.getLogger(__name__)
+
+SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "your_jwt_secret_key")
 
 ALGORITHM = "HS256"
 
+TOKEN_TTL_SECONDS = int(os.environ.get("TOKEN_TTL_SECONDS", "3600"))
+
 
 async def loginUser(username: str, password: str) -> LoginResponse:
     """
@@ -56,13 +66,42 @@ async def loginUser(username: str, password: str) -> LoginResponse:
     """
     import prisma.models
 
-    user = await prisma.models.User.prisma().find_first(where={"email": username})
-    if not user or not bcrypt.checkpw(
-        password.encode("utf-8"), user.password.encode("utf-8")
+    user = await project.database.run_read(
+        "user_by_email",
+        lambda client: prisma.models.User.prisma(client).find_first(
+            where={"email": username}
+        ),
+        f"email:{username}",
+    )
+    if not user or not await project.password_hashing.verify_password(
+        password, user.password
     ):
-        raise ValueError("Invalid username or password")
+        raise project.errors.AuthenticationError("Invalid username or password")
+    if project.password_hashing.needs_rehash(user.password):
+        # The work factor changed since this hash was stored; upgrade it while we know the password,
+        # unless the password was changed meanwhile.
+        try:
+            rehashed = await prisma.models.User.prisma().update_many(
+                where={"id": user.id, "password": user.password},
+                data={
+                    "password": await project.password_hashing.hash_password(password),
+                    "version": {"increment": 1},
+                },
+            )
+            if rehashed:
+                await project.user_cache.user_cache.invalidate(user.id, user.email)
+        except Exception:
+            logger.warning(
+                "Could not rehash password for user %s", user.id, exc_info=True
+            )
     user_details = UserDetails(id=user.id, email=user.email, role=Role[user.role])
     token = jwt.encode(
-        {"user_id": user.id, "role": user.role}, SECRET_KEY, algorithm=ALGORITHM
+        {
+            "user_id": user.id,
+            "role": user.role,
+            "exp": int(time.time()) + TOKEN_TTL_SECONDS,
+        },
+        SECRET_KEY,
+        algorithm=ALGORITHM,
     )
     return LoginResponse(token=token, user=user_details)
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Any, Dict, Optional, Tuple
+
+import project.metrics
+
+logger = logging.getLogger(__name__)
+
+LOOP_MONITOR_ENABLED = os.environ.get("LOOP_MONITOR", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+LOOP_MONITOR_INTERVAL_SECONDS = float(
+    os.environ.get("LOOP_MONITOR_INTERVAL_SECONDS", "0.05")
+)
+
+LOOP_BLOCK_THRESHOLD_SECONDS = float(
+    os.environ.get("LOOP_BLOCK_THRESHOLD_SECONDS", "0.1")
+)
+
+event_loop_lag_seconds = project.metrics.Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran the monitor's heartbeat.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+event_loop_blocks = project.metrics.Counter(
+    "event_loop_blocks_total",
+    "Times a single callback held the event loop longer than LOOP_BLOCK_THRESHOLD_SECONDS, by route.",
+    ("route",),
+)
+
+
+def route_of(scope: Dict[str, Any]) -> str:
+    """
+    Returns the route template of an ASGI scope once the router has seen it, e.g. /api/users/{userId}.
+
+    Args:
+        scope (Dict[str, Any]): The request's ASGI scope.
+
+    Returns:
+        str: The route template, or "unmatched" when no route was matched (yet).
+    """
+    router = scope.get("router")
+    endpoint = scope.get("endpoint")
+    for route in getattr(router, "routes", ()):
+        if endpoint is not None and getattr(route, "endpoint", None) is endpoint:
+            return route.path
+        if getattr(route, "path", None) == scope.get("path"):
+            return route.path
+    return "unmatched"
+
+
+def _request_scope(frame: Optional[FrameType]) -> Optional[Dict[str, Any]]:
+    # The awaiting coroutines of the running task are on the stack, so the innermost frame holding
+    # an HTTP scope belongs to the request being served.
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and scope.get("type") == "http":
+            return scope
+        frame = frame.f_back
+    return None
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag with a heartbeat task and flags callbacks that hold the loop for longer
+    than a threshold, i.e. synchronous work hidden in async code.
+
+    A watchdog thread notices when the heartbeat is overdue while the loop is still blocked and
+    captures the loop thread's stack and the route being served. Once the loop runs again the block
+    is logged with that stack and counted in `event_loop_blocks_total`.
+
+    Args:
+        interval_seconds (float): Time between heartbeats.
+        threshold_seconds (float): Blocking time above which a callback is flagged.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = LOOP_MONITOR_INTERVAL_SECONDS,
+        threshold_seconds: float = LOOP_BLOCK_THRESHOLD_SECONDS,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.threshold_seconds = threshold_seconds
+        self.last_lag = 0.0
+        self._beat = time.monotonic()
+        self._blocked: Optional[Tuple[str, str]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def _capture(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        scope = _request_scope(frame)
+        route = route_of(scope) if scope is not None else "none"
+        self._blocked = (route, "".join(traceback.format_stack(frame)))
+
+    def _watch(self) -> None:
+        captured_beat = None
+        while not self._stopped.wait(self.threshold_seconds / 4):
+            beat = self._beat
+            overdue = time.monotonic() - beat - self.interval_seconds
+            if overdue > self.threshold_seconds and beat != captured_beat:
+                captured_beat = beat
+                self._capture()
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(loop.time() - expected, 0.0)
+            self._beat = time.monotonic()
+            self.last_lag = lag
+            event_loop_lag_seconds.observe(lag)
+            if lag < self.threshold_seconds:
+                continue
+            blocked, self._blocked = self._blocked, None
+            route, stack = blocked or ("unknown", "(stack not captured)\n")
+            event_loop_blocks.labels(route).inc()
+            logger.warning(
+                "Event loop blocked for %.1f ms while serving %s; blocking stack:\n%s",
+                lag * 1000,
+                route,
+                stack,
+            )
+
+    def start(self) -> None:
+        """
+        Starts the heartbeat on the running loop and the watchdog thread.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """
+        Stops the heartbeat and the watchdog thread.
+        """
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,269 @@
+import bisect
+from typing import Dict, List, Sequence, Tuple
+
+
+class _Metric:
+    """
+    Base class for in-process metrics that are optionally split by label values.
+    """
+
+    type = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        register(self)
+
+    def labels(self, *labelvalues: str) -> "_Child":
+        """
+        Returns the child metric bound to the given label values.
+
+        Args:
+            *labelvalues (str): One value per label name, in declaration order.
+
+        Returns:
+            _Child: A metric bound to the label values.
+        """
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labelvalues}"
+            )
+        return _Child(self, labelvalues)
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        return list(self._values.items())
+
+    def _inc(self, key: Tuple[str, ...], amount: float) -> None:
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _set(self, key: Tuple[str, ...], value: float) -> None:
+        raise TypeError(f"{self.name} is a {self.type} and cannot be set")
+
+    def _observe(self, key: Tuple[str, ...], value: float) -> None:
+        raise TypeError(f"{self.name} is a {self.type} and cannot observe values")
+
+
+class Counter(_Metric):
+    """
+    A monotonically increasing in-process counter.
+    """
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._inc((), amount)
+
+    def _inc(self, key: Tuple[str, ...], amount: float) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only be incremented")
+        super()._inc(key, amount)
+
+
+class Gauge(_Metric):
+    """
+    An in-process value that can go up and down, such as a queue depth.
+    """
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._inc((), amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._inc((), -amount)
+
+    def set(self, value: float) -> None:
+        self._set((), value)
+
+    def _set(self, key: Tuple[str, ...], value: float) -> None:
+        self._values[key] = value
+
+
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram(_Metric):
+    """
+    Counts observations, such as latencies in seconds, into cumulative upper-bound buckets.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float) -> None:
+        self._observe((), value)
+
+    def count(self, *labelvalues: str) -> int:
+        return sum(self._counts.get(labelvalues, ()))
+
+    def sum(self, *labelvalues: str) -> float:
+        return self._sums.get(labelvalues, 0.0)
+
+    def bucket_samples(self) -> List[Tuple[Tuple[str, ...], List[int], float]]:
+        """
+        Returns, per label set, the cumulative count for each bucket bound (plus +Inf) and the sum.
+        """
+        samples = []
+        for key, counts in self._counts.items():
+            cumulative, running = [], 0
+            for count in counts:
+                running += count
+                cumulative.append(running)
+            samples.append((key, cumulative, self._sums[key]))
+        return samples
+
+    def _observe(self, key: Tuple[str, ...], value: float) -> None:
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def _inc(self, key: Tuple[str, ...], amount: float) -> None:
+        raise TypeError(f"{self.name} is a histogram and cannot be incremented")
+
+
+class _Child:
+    __slots__ = ("_parent", "_key")
+
+    def __init__(self, parent: _Metric, key: Tuple[str, ...]) -> None:
+        self._parent = parent
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._parent._inc(self._key, amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._parent._inc(self._key, -amount)
+
+    def set(self, value: float) -> None:
+        self._parent._set(self._key, value)
+
+    def observe(self, value: float) -> None:
+        self._parent._observe(self._key, value)
+
+
+_registry: Dict[str, _Metric] = {}
+
+
+def register(metric: _Metric) -> None:
+    """
+    Adds a metric to the process-wide registry. Metric names must be unique.
+
+    Args:
+        metric (_Metric): The metric to register.
+    """
+    if metric.name in _registry:
+        raise ValueError(f"Metric {metric.name} is already registered")
+    _registry[metric.name] = metric
+
+
+def get_metric(name: str) -> _Metric:
+    """
+    Looks up a registered metric by name.
+
+    Args:
+        name (str): The metric name.
+
+    Returns:
+        _Metric: The registered metric.
+    """
+    return _registry[name]
+
+
+def all_metrics() -> List[_Metric]:
+    return list(_registry.values())
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def render_text() -> str:
+    """
+    Renders every registered metric in the Prometheus text exposition format (version 0.0.4).
+
+    Returns:
+        str: The exposition, e.g. for a `/metrics` endpoint.
+
+    Example:
+        print(render_text())
+        > # HELP http_requests_total Requests handled, by method, route and status.
+        > # TYPE http_requests_total counter
+        > http_requests_total{method="GET",route="/hello",status="200"} 3
+    """
+    lines = []
+    for metric in _registry.values():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        if isinstance(metric, Histogram):
+            bounds = [repr(float(bound)) for bound in metric.buckets] + ["+Inf"]
+            names = metric.labelnames + ("le",)
+            for key, cumulative, total in metric.bucket_samples():
+                for bound, count in zip(bounds, cumulative):
+                    labels = _format_labels(names, key + (bound,))
+                    lines.append(f"{metric.name}_bucket{labels} {count}")
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{metric.name}_count{labels} {cumulative[-1]}")
+        else:
+            for key, value in metric.samples():
+                labels = _format_labels(metric.labelnames, key)
+                lines.append(f"{metric.name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,81 @@
+import os
+from typing import Optional
+
+import bcrypt
+import project.worker_pool
+
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+
+def _hashpw(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+async def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """
+    Hashes a password with bcrypt on the hash worker pool, so the event loop never blocks on it.
+
+    Args:
+        password (str): The plain-text password.
+        rounds (Optional[int]): The bcrypt work factor. Defaults to BCRYPT_ROUNDS.
+
+    Returns:
+        str: The bcrypt hash to store in the password column.
+
+    Example:
+        hashed = await hash_password("password123")
+        > '$2b$12$...'
+    """
+    return await project.worker_pool.hash_pool.run(
+        _hashpw, password.encode("utf-8"), rounds or BCRYPT_ROUNDS
+    )
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    """
+    Checks a plain-text password against a stored bcrypt hash on the hash worker pool.
+
+    Args:
+        password (str): The plain-text password.
+        hashed (str): The stored bcrypt hash.
+
+    Returns:
+        bool: True if the password matches the hash.
+    """
+    try:
+        return await project.worker_pool.hash_pool.run(
+            bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8")
+        )
+    except ValueError:
+        # The stored value is not a bcrypt hash (e.g. a legacy plain-text password).
+        return False
+
+
+def hash_rounds(hashed: str) -> Optional[int]:
+    """
+    Extracts the work factor from a bcrypt hash such as '$2b$12$...'.
+
+    Args:
+        hashed (str): The stored bcrypt hash.
+
+    Returns:
+        Optional[int]: The work factor, or None if the value is not a bcrypt hash.
+    """
+    parts = hashed.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed: str) -> bool:
+    """
+    Tells whether a stored hash was produced with a different work factor than BCRYPT_ROUNDS and
+    should be replaced the next time the plain-text password is known (i.e. on login).
+
+    Args:
+        hashed (str): The stored bcrypt hash.
+
+    Returns:
+        bool: True if the hash should be recomputed.
+    """
+    return hash_rounds(hashed) != BCRYPT_ROUNDS
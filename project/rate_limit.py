@@ -0,0 +1,196 @@
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import List, Protocol, Tuple
+
+import project.errors
+import project.metrics
+from fastapi import Request
+
+logger = logging.getLogger(__name__)
+
+LOGIN_RATE_LIMIT_WINDOW_SECONDS = float(
+    os.environ.get("LOGIN_RATE_LIMIT_WINDOW_SECONDS", "60")
+)
+
+LOGIN_RATE_LIMIT_PER_IP = int(os.environ.get("LOGIN_RATE_LIMIT_PER_IP", "30"))
+
+LOGIN_RATE_LIMIT_PER_ACCOUNT = int(os.environ.get("LOGIN_RATE_LIMIT_PER_ACCOUNT", "10"))
+
+RATE_LIMIT_MAX_KEYS = int(os.environ.get("RATE_LIMIT_MAX_KEYS", "100000"))
+
+RATE_LIMIT_SHARDS = int(os.environ.get("RATE_LIMIT_SHARDS", "16"))
+
+RATE_LIMIT_REDIS_URL = os.environ.get("RATE_LIMIT_REDIS_URL")
+
+rate_limit_checks = project.metrics.Counter(
+    "rate_limit_checks_total",
+    "Attempts checked against a rate limit, by limit and outcome.",
+    ("limit", "outcome"),
+)
+rate_limit_evictions = project.metrics.Counter(
+    "rate_limit_evictions_total",
+    "Least recently used keys dropped to keep the in-process limiter bounded.",
+)
+rate_limit_keys = project.metrics.Gauge(
+    "rate_limit_keys", "Keys tracked by the in-process limiter."
+)
+
+
+class RateLimitBackend(Protocol):
+    """
+    Storage used by RateLimiter. `hit` records an attempt for `key` and returns 0 if it is within
+    `limit` attempts per `window` seconds, otherwise the seconds until the next attempt is allowed.
+    """
+
+    async def hit(self, key: str, limit: int, window: float) -> float: ...
+
+
+class LocalRateLimitBackend:
+    """
+    Per-process token buckets: each key may burst `limit` attempts and regains one every
+    `window / limit` seconds.
+
+    Keys are spread over independent LRU shards of at most `max_keys / shards` entries each, so
+    memory stays bounded and an eviction only scans one small shard. A check never awaits, so on
+    the event loop it is atomic without any lock.
+
+    Args:
+        max_keys (int): The maximum number of keys tracked.
+        shards (int): The number of shards.
+    """
+
+    def __init__(
+        self, max_keys: int = RATE_LIMIT_MAX_KEYS, shards: int = RATE_LIMIT_SHARDS
+    ) -> None:
+        self._shards: List["OrderedDict[str, Tuple[float, float]]"] = [
+            OrderedDict() for _ in range(max(shards, 1))
+        ]
+        self._max_per_shard = max(max_keys // len(self._shards), 1)
+        self._size = 0
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = time.monotonic()
+        rate = limit / window
+        bucket = shard.get(key)
+        if bucket is None:
+            tokens = float(limit)
+            self._size += 1
+        else:
+            tokens = min(float(limit), bucket[0] + (now - bucket[1]) * rate)
+            shard.move_to_end(key)
+        if tokens < 1:
+            shard[key] = (tokens, now)
+            return (1 - tokens) / rate
+        shard[key] = (tokens - 1, now)
+        if len(shard) > self._max_per_shard:
+            shard.popitem(last=False)
+            self._size -= 1
+            rate_limit_evictions.inc()
+        rate_limit_keys.set(self._size)
+        return 0.0
+
+
+class RedisRateLimitBackend:
+    """
+    Fixed-window counters in Redis shared by all workers, so limits hold across the whole
+    deployment. Requires the optional `redis` package (the "redis" extra).
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:") -> None:
+        import redis.asyncio
+
+        self._redis = redis.asyncio.from_url(url)
+        self._prefix = prefix
+
+    async def hit(self, key: str, limit: int, window: float) -> float:
+        now = time.time()
+        window_key = f"{self._prefix}{key}:{int(now // window)}"
+        pipeline = self._redis.pipeline()
+        pipeline.incr(window_key)
+        pipeline.pexpire(window_key, int(window * 1000))
+        count, _ = await pipeline.execute()
+        if count <= limit:
+            return 0.0
+        return window - now % window
+
+
+class RateLimiter:
+    """
+    Enforces attempt limits on keys such as a client address or an account. If the backend fails,
+    attempts are let through rather than locking everyone out.
+
+    Args:
+        backend (RateLimitBackend): Where attempts are counted.
+    """
+
+    def __init__(self, backend: RateLimitBackend) -> None:
+        self.backend = backend
+
+    async def check(self, name: str, key: str, limit: int, window: float) -> None:
+        """
+        Records an attempt and rejects it with 429 and Retry-After if it exceeds the limit.
+
+        Args:
+            name (str): The limit's name, e.g. "login_ip", used in the key and in metrics.
+            key (str): What is limited, e.g. the client address.
+            limit (int): Attempts allowed per window; 0 disables the limit.
+            window (float): The window in seconds.
+
+        Example:
+            await rate_limiter.check("login_ip", "203.0.113.7", 30, 60)
+        """
+        if limit <= 0:
+            return
+        try:
+            retry_after = await self.backend.hit(f"{name}:{key}", limit, window)
+        except Exception:
+            logger.warning("Rate limit backend failed", exc_info=True)
+            rate_limit_checks.labels(name, "error").inc()
+            return
+        if not retry_after:
+            rate_limit_checks.labels(name, "allowed").inc()
+            return
+        rate_limit_checks.labels(name, "limited").inc()
+        raise project.errors.RateLimitedError(
+            "Too many login attempts, retry later",
+            headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+        )
+
+
+def _make_backend() -> RateLimitBackend:
+    if RATE_LIMIT_REDIS_URL:
+        return RedisRateLimitBackend(RATE_LIMIT_REDIS_URL)
+    return LocalRateLimitBackend()
+
+
+rate_limiter = RateLimiter(_make_backend())
+
+
+async def login_throttle(request: Request) -> None:
+    """
+    FastAPI dependency that limits login attempts per client address and per account, so a
+    credential-stuffing burst is rejected before any database lookup or password hash.
+
+    The address is `request.client`, which the server resolves from X-Forwarded-For when the
+    connection comes from a trusted proxy (FORWARDED_ALLOW_IPS), rather than the proxy's own
+    address shared by every client.
+
+    Args:
+        request (Request): The login request.
+    """
+    client = request.client.host if request.client else "unknown"
+    await rate_limiter.check(
+        "login_ip", client, LOGIN_RATE_LIMIT_PER_IP, LOGIN_RATE_LIMIT_WINDOW_SECONDS
+    )
+    username = request.query_params.get("username")
+    if username:
+        await rate_limiter.check(
+            "login_account",
+            username.strip().lower(),
+            LOGIN_RATE_LIMIT_PER_ACCOUNT,
+            LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+        )
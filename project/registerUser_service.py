@@ -1,5 +1,9 @@
 import prisma
+import prisma.errors
 import prisma.models
+import project.errors
+import project.password_hashing
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -30,7 +34,12 @@ async def registerUser(
         await registerUser("john_doe", "securepassword123", "john.doe@example.com")
         > RegisterUserResponse(message="User successfully registered", user_id=1)
     """
-    user = await prisma.models.User.prisma().create(
-        data={"email": email, "password": password}
-    )
+    hashed = await project.password_hashing.hash_password(password)
+    try:
+        user = await prisma.models.User.prisma().create(
+            data={"email": email, "password": hashed}
+        )
+    except prisma.errors.UniqueViolationError:
+        raise project.errors.ConflictError(f"Email {email} is already in use")
+    await project.user_cache.user_cache.put(user)
     return RegisterUserResponse(message="User successfully registered", user_id=user.id)
@@ -0,0 +1,18 @@
+import project.registerUser_service
+from fastapi import APIRouter
+
+router = APIRouter()
+
+
+@router.post(
+    "/api/users/register",
+    response_model=project.registerUser_service.RegisterUserResponse,
+)
+async def api_post_registerUser(
+    username: str, password: str, email: str
+) -> project.registerUser_service.RegisterUserResponse:
+    """
+    Registers a new user. This endpoint accepts user details like username, password, email, etc., and creates a new user record in the database. Expected response is a success message with the user's ID.
+    """
+    res = await project.registerUser_service.registerUser(username, password, email)
+    return res
@@ -0,0 +1,28 @@
+import project.docs_registry
+from pydantic import BaseModel
+
+
+class ReloadDocumentationResponse(BaseModel):
+    """
+    Response model for rebuilding the documentation registry. It reports how many endpoints were documented and how many APIDocumentationModule overrides were applied.
+    """
+
+    endpoints: int
+    overrides: int
+
+
+async def reloadDocumentation() -> ReloadDocumentationResponse:
+    """
+    Rebuilds the in-memory documentation registry from the route table and the APIDocumentationModule table, e.g. after the table was edited. Only the worker handling the request is reloaded; the others pick the changes up on their next restart.
+
+    Returns:
+        ReloadDocumentationResponse: The number of documented endpoints and of applied overrides.
+
+    Example:
+        await reloadDocumentation()
+        > ReloadDocumentationResponse(endpoints=18, overrides=1)
+    """
+    registry = await project.docs_registry.docs_registry.reload()
+    return ReloadDocumentationResponse(
+        endpoints=len(registry.endpoints), overrides=len(registry.overrides)
+    )
@@ -0,0 +1,98 @@
+import json
+from contextvars import ContextVar
+from typing import Any, Optional
+
+import project.http_cache
+from fastapi.responses import JSONResponse
+
+# Both are optional: orjson comes with FastAPI's standard extras, msgpack has to be installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+_accepts_msgpack: ContextVar[bool] = ContextVar("accepts_msgpack", default=False)
+
+
+def accepts_msgpack(accept: Optional[bytes]) -> bool:
+    """
+    Tells whether an Accept header asks for MessagePack, and MessagePack support is installed.
+
+    Args:
+        accept (Optional[bytes]): The raw Accept request header, if any.
+
+    Returns:
+        bool: True if the response should be encoded with MessagePack.
+
+    Example:
+        accepts_msgpack(b"application/msgpack, application/json;q=0.5")
+        > True
+    """
+    if msgpack is None or not accept:
+        return False
+    return any(
+        media_range.split(b";")[0].strip()
+        in (b"application/msgpack", b"application/x-msgpack")
+        for media_range in accept.split(b",")
+    )
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encodes JSON-compatible content as compact JSON, with orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class NegotiatedResponse(JSONResponse):
+    """
+    The default response class: encodes the (already validated and JSON-compatible) response
+    content with orjson, or with MessagePack when the request's Accept header asks for it and
+    msgpack is installed. Responses then vary on Accept so shared caches keep the formats apart.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if _accepts_msgpack.get():
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return msgpack.packb(content)
+        return dumps(content)
+
+    def init_headers(self, headers=None) -> None:
+        super().init_headers(headers)
+        if msgpack is not None:
+            self.raw_headers.append((b"vary", b"Accept"))
+
+
+class ContentNegotiationMiddleware:
+    """
+    ASGI middleware that records whether a request accepts MessagePack, for NegotiatedResponse.
+
+    Args:
+        app: The wrapped ASGI application.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or msgpack is None:
+            await self.app(scope, receive, send)
+            return
+        token = _accepts_msgpack.set(
+            accepts_msgpack(project.http_cache.request_header(scope, b"accept"))
+        )
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _accepts_msgpack.reset(token)
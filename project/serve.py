@@ -0,0 +1,205 @@
+import importlib.util
+import logging
+import math
+import os
+from typing import Any, Dict, Optional
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+APP = "project.server:app"
+
+HOST = os.environ.get("HOST", "0.0.0.0")
+
+PORT = int(os.environ.get("PORT", "8000"))
+
+SERVER_LOOP = os.environ.get("SERVER_LOOP", "auto")
+
+SERVER_HTTP = os.environ.get("SERVER_HTTP", "auto")
+
+SERVER_BACKLOG = int(os.environ.get("SERVER_BACKLOG", "2048"))
+
+SERVER_KEEPALIVE_SECONDS = int(os.environ.get("SERVER_KEEPALIVE_SECONDS", "5"))
+
+SERVER_MAX_REQUESTS = int(os.environ.get("SERVER_MAX_REQUESTS", "0"))
+
+SERVER_MAX_REQUESTS_JITTER = int(
+    os.environ.get("SERVER_MAX_REQUESTS_JITTER", str(SERVER_MAX_REQUESTS // 10))
+)
+
+SERVER_GRACEFUL_TIMEOUT_SECONDS = int(
+    os.environ.get("SERVER_GRACEFUL_TIMEOUT_SECONDS", "30")
+)
+
+# Take the client address and scheme from X-Forwarded-For / X-Forwarded-Proto, when the connection
+# comes from one of FORWARDED_ALLOW_IPS (addresses or networks of the proxies in front of us).
+SERVER_PROXY_HEADERS = os.environ.get("SERVER_PROXY_HEADERS", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+FORWARDED_ALLOW_IPS = os.environ.get("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+SERVER_PRELOAD = os.environ.get("SERVER_PRELOAD", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+def available_cpus() -> int:
+    """
+    Returns how many CPUs this process may use: the CPUs it is pinned to, further capped by a cgroup
+    (container) CPU quota when one is set.
+
+    Returns:
+        int: The number of usable CPUs, at least 1.
+
+    Example:
+        # in a container started with --cpus=2 on a 16 core host
+        available_cpus()
+        > 2
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    quota: Optional[float] = None
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            limit, period = f.read().split()
+        if limit != "max":
+            quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                limit = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+            if limit > 0:
+                quota = limit / period
+        except (OSError, ValueError):
+            pass
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+def _resolve(setting: str, fast: str, fallback: str) -> str:
+    if setting != "auto":
+        return setting
+    return fast if importlib.util.find_spec(fast) is not None else fallback
+
+
+def server_settings() -> Dict[str, Any]:
+    """
+    Resolves the serving settings from the environment.
+
+    Returns:
+        Dict[str, Any]: The worker count, event loop and HTTP parser implementations, socket tuning and proxy header handling.
+
+    Example:
+        server_settings()
+        > {'workers': 4, 'loop': 'uvloop', 'http': 'httptools', 'backlog': 2048, 'keepalive': 5, ...}
+    """
+    return {
+        "workers": int(os.environ.get("WEB_CONCURRENCY", available_cpus())),
+        "loop": _resolve(SERVER_LOOP, "uvloop", "asyncio"),
+        "http": _resolve(SERVER_HTTP, "httptools", "h11"),
+        "backlog": SERVER_BACKLOG,
+        "keepalive": SERVER_KEEPALIVE_SECONDS,
+        "max_requests": SERVER_MAX_REQUESTS,
+        "max_requests_jitter": SERVER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "preload": SERVER_PRELOAD,
+        "proxy_headers": SERVER_PROXY_HEADERS,
+        "forwarded_allow_ips": FORWARDED_ALLOW_IPS,
+    }
+
+
+def _serve_gunicorn(settings: Dict[str, Any]) -> None:
+    import gunicorn.app.base
+    import uvicorn.workers
+
+    class Worker(uvicorn.workers.UvicornWorker):
+        CONFIG_KWARGS = {
+            "loop": settings["loop"],
+            "http": settings["http"],
+            "proxy_headers": settings["proxy_headers"],
+        }
+
+    class Application(gunicorn.app.base.BaseApplication):
+        def load_config(self) -> None:
+            options = {
+                "bind": f"{HOST}:{PORT}",
+                "workers": settings["workers"],
+                "worker_class": Worker,
+                "backlog": settings["backlog"],
+                "keepalive": settings["keepalive"],
+                "max_requests": settings["max_requests"],
+                "max_requests_jitter": settings["max_requests_jitter"],
+                "graceful_timeout": settings["graceful_timeout"],
+                "preload_app": settings["preload"],
+                "forwarded_allow_ips": settings["forwarded_allow_ips"],
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            import project.server
+
+            return project.server.app
+
+    Application().run()
+
+
+def _serve_uvicorn(settings: Dict[str, Any]) -> None:
+    if settings["max_requests"]:
+        # Without gunicorn nothing replaces a worker that exits, so recycling would shrink the pool.
+        logger.warning(
+            "SERVER_MAX_REQUESTS needs gunicorn for worker recycling; ignoring it"
+        )
+    uvicorn.run(
+        APP,
+        host=HOST,
+        port=PORT,
+        workers=settings["workers"],
+        loop=settings["loop"],
+        http=settings["http"],
+        backlog=settings["backlog"],
+        timeout_keep_alive=settings["keepalive"],
+        timeout_graceful_shutdown=settings["graceful_timeout"],
+        proxy_headers=settings["proxy_headers"],
+        forwarded_allow_ips=settings["forwarded_allow_ips"],
+    )
+
+
+def main() -> None:
+    """
+    Serves the app with one worker process per available CPU. Uses gunicorn with uvicorn workers
+    when gunicorn is installed, which adds a preloaded app and graceful recycling of workers after
+    SERVER_MAX_REQUESTS requests; otherwise uses uvicorn's own process manager.
+    """
+    logging.basicConfig(level=logging.INFO)
+    settings = server_settings()
+    use_gunicorn = importlib.util.find_spec("gunicorn") is not None
+    logger.info(
+        "Serving %s with %s: %d workers, %s loop, %s HTTP parser, backlog %d, keep-alive %ds",
+        APP,
+        "gunicorn" if use_gunicorn else "uvicorn",
+        settings["workers"],
+        settings["loop"],
+        settings["http"],
+        settings["backlog"],
+        settings["keepalive"],
+    )
+    if use_gunicorn:
+        _serve_gunicorn(settings)
+    else:
+        _serve_uvicorn(settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,89 +1,271 @@
 import logging
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
 
+import project.auth
 import project.checkHealth_service
 import project.createUser_service
+import project.database
 import project.deleteUser_service
-import project.get_health_status_service
+import project.docs_registry
+import project.errors
+import project.fast_responses
 import project.getAPIDocumentation_service
 import project.getDocumentation_service
+import project.get_health_status_service
 import project.getHelloWorld_service
 import project.getUser_service
 import project.getUserDetails_service
+import project.getUsersBatch_service
+import project.health_cache
 import project.health_check_service
+import project.health_probe
+import project.http_cache
+import project.instrumentation
+import project.lazy_routes
+import project.loop_monitor
+import project.listUsers_service
+import project.logging_setup
 import project.loginUser_service
-import project.registerUser_service
+import project.metrics
+import project.rate_limit
 import project.sayHelloWorld_service
+import project.serialization
 import project.updateUser_service
 import project.updateUserDetails_service
-from fastapi import FastAPI
-from fastapi.encoders import jsonable_encoder
+import project.worker_pool
+from fastapi import Depends, FastAPI, Request
 from fastapi.responses import Response
-from prisma import Prisma
+from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
-db_client = Prisma(auto_register=True)
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await db_client.connect()
+    project.logging_setup.start()
+    if project.loop_monitor.LOOP_MONITOR_ENABLED:
+        project.loop_monitor.loop_monitor.start()
+    await project.database.connect()
+    if not project.database.DB_CONNECT_IN_BACKGROUND:
+        # Otherwise the first request loads it, once the database is up.
+        await project.health_cache.health_cache.load()
+    project.health_probe.health_prober.start()
     yield
-    await db_client.disconnect()
+    project.health_probe.health_prober.stop()
+    await project.database.disconnect()
+    project.worker_pool.hash_pool.shutdown()
+    project.loop_monitor.loop_monitor.stop()
+    project.logging_setup.stop()
 
 
 app = FastAPI(
     title="hello world",
     lifespan=lifespan,
+    default_response_class=project.serialization.NegotiatedResponse,
     description='create an app that has only one endpoint, that just returns "hello world"',
 )
 
+# /api/docs and /api/documentation document every route, built once from the route table.
+project.docs_registry.docs_registry.routes = app.router.routes
+
+
+def health_cache_fast_path(
+    response_model: type[BaseModel], cache_control: Optional[str] = None
+) -> project.fast_responses.PrecomputedJSON:
+    """
+    Builds the precomputed endpoint for a route that only echoes the cached HealthCheckModule content.
+    """
+    health_cache = project.health_cache.health_cache
+    return project.fast_responses.PrecomputedJSON(
+        lambda: response_model(message=health_cache.current()),
+        version=lambda: health_cache.version,
+        refresh=health_cache.get_message,
+        cache_control=cache_control,
+    )
+
+
+def docs_registry_fast_path(
+    build: Callable[[project.docs_registry.DocsRegistry], BaseModel],
+) -> project.fast_responses.PrecomputedJSON:
+    """
+    Builds the precomputed endpoint for a documentation route served from the in-memory documentation registry.
+    """
+    docs_registry = project.docs_registry.docs_registry
+    return project.fast_responses.PrecomputedJSON(
+        lambda: build(docs_registry),
+        version=lambda: docs_registry.version,
+        refresh=docs_registry.get,
+        cache_control=project.http_cache.CACHE_CONTROL_DOCS,
+    )
+
+
+app.add_middleware(project.serialization.ContentNegotiationMiddleware)
+
+# ETag and Cache-Control for these routes when they are served by the route stack rather than the fast path.
+app.add_middleware(
+    project.http_cache.ConditionalGetMiddleware,
+    policies={
+        "/health-check": None,
+        "/hello": project.http_cache.CACHE_CONTROL_HELLO,
+        "/healthcheck": None,
+        "/api/health-check": None,
+        "/api/hello-world": project.http_cache.CACHE_CONTROL_HELLO,
+        "/api/docs": project.http_cache.CACHE_CONTROL_DOCS,
+        "/api/documentation": project.http_cache.CACHE_CONTROL_DOCS,
+    },
+)
+
+app.add_middleware(
+    project.fast_responses.FastPathMiddleware,
+    endpoints={
+        "/health-check": health_cache_fast_path(
+            project.health_check_service.HealthCheckResponseModel
+        ),
+        "/hello": health_cache_fast_path(
+            project.getHelloWorld_service.GetHelloResponse,
+            project.http_cache.CACHE_CONTROL_HELLO,
+        ),
+        "/healthcheck": health_cache_fast_path(
+            project.get_health_status_service.HealthCheckResponseModel
+        ),
+        "/api/health-check": health_cache_fast_path(
+            project.checkHealth_service.HealthCheckResponseModel
+        ),
+        "/api/hello-world": project.fast_responses.PrecomputedJSON(
+            lambda: project.sayHelloWorld_service.sayHelloWorld(
+                project.sayHelloWorld_service.HelloWorldRequestModel()
+            ),
+            cache_control=project.http_cache.CACHE_CONTROL_HELLO,
+        ),
+        "/api/docs": docs_registry_fast_path(
+            project.getDocumentation_service.documentation_response
+        ),
+        "/api/documentation": docs_registry_fast_path(
+            project.getAPIDocumentation_service.api_documentation_response
+        ),
+    },
+)
+
+
+@app.exception_handler(project.errors.DomainError)
+async def domain_error_handler(
+    request: Request, exc: project.errors.DomainError
+) -> Response:
+    """
+    Answers expected outcomes (bad credentials, missing records, conflicts, invalid arguments) with their status code. They are not faults, so nothing is logged.
+    """
+    return project.serialization.NegotiatedResponse(
+        content={"error": str(exc)}, status_code=exc.status_code, headers=exc.headers
+    )
+
+
+@app.exception_handler(project.worker_pool.PoolSaturatedError)
+async def pool_saturated_handler(
+    request: Request, exc: project.worker_pool.PoolSaturatedError
+) -> Response:
+    """
+    Sheds requests that would queue behind a full worker pool, telling clients when to retry.
+    """
+    logger.warning("Shedding %s %s: %s", request.method, request.url.path, exc)
+    return project.serialization.NegotiatedResponse(
+        content={"error": str(exc)},
+        status_code=503,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(Exception)
+async def unhandled_error_handler(request: Request, exc: Exception) -> Response:
+    """
+    Answers real faults with a 500 and logs them with their traceback.
+    """
+    logger.error(
+        "Error processing %s %s", request.method, request.url.path, exc_info=exc
+    )
+    return project.serialization.NegotiatedResponse(
+        content={"error": str(exc)}, status_code=500
+    )
+
+
+LAZY_ROUTERS = {
+    "project.bulk_routes:router": ("/api/users/import", "/api/users/export"),
+    "project.docs_routes:router": (
+        "/api/docs",
+        "/api/documentation",
+        "/api/docs/reload",
+    ),
+    "project.registration_routes:router": ("/api/users/register",),
+}
+
+if project.lazy_routes.LAZY_ROUTES_ENABLED:
+    app.add_middleware(
+        project.lazy_routes.LazyRoutesMiddleware, target=app, routers=LAZY_ROUTERS
+    )
+else:
+    for spec in LAZY_ROUTERS:
+        project.lazy_routes.include_first(app, spec)
+
+app.add_middleware(
+    project.instrumentation.InstrumentationMiddleware, routes=app.router.routes
+)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def api_get_metrics() -> Response:
+    """
+    Exposes the process metrics (request counts, latency and database time per route, caches, pools) in the Prometheus text format.
+    """
+    return Response(
+        content=project.metrics.render_text(),
+        media_type=project.metrics.CONTENT_TYPE,
+    )
+
+
+@app.get("/health/live", include_in_schema=False)
+async def api_get_liveness() -> Response:
+    """
+    Liveness probe: answers as long as the process can serve requests, without touching any dependency.
+    """
+    return Response(content=b'{"status":"ok"}', media_type="application/json")
+
+
+@app.get("/health/ready", include_in_schema=False)
+async def api_get_readiness() -> Response:
+    """
+    Readiness probe: serves the last snapshot of the background dependency prober (database connectivity, pool saturation, event-loop lag), with 503 until the first probe passes or while a critical check fails. It never queries the database itself.
+    """
+    prober = project.health_probe.health_prober
+    return Response(
+        content=prober.body,
+        status_code=200 if prober.snapshot.ready else 503,
+        media_type="application/json",
+    )
+
 
 @app.get(
     "/health-check",
     response_model=project.health_check_service.HealthCheckResponseModel,
 )
 async def api_get_health_check(
-    request: project.health_check_service.HealthCheckRequestModel,
-) -> project.health_check_service.HealthCheckResponseModel | Response:
+    request: project.health_check_service.HealthCheckRequestModel = Depends(),
+) -> project.health_check_service.HealthCheckResponseModel:
     """
     This endpoint serves as a health check for the application. When accessed with a GET request, it will return a simple text response of 'hello world'. This is used to indicate that the application is up and running. Since this is a basic status check, it should be publicly accessible to allow for easy monitoring by anyone or any automated system.
     """
-    try:
-        res = project.health_check_service.health_check(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = project.health_check_service.health_check(request)
+    return res
 
 
 @app.get("/hello", response_model=project.getHelloWorld_service.GetHelloResponse)
 async def api_get_getHelloWorld(
-    request: project.getHelloWorld_service.GetHelloRequest,
-) -> project.getHelloWorld_service.GetHelloResponse | Response:
+    request: project.getHelloWorld_service.GetHelloRequest = Depends(),
+) -> project.getHelloWorld_service.GetHelloResponse:
     """
     This endpoint returns a simple 'hello world' message. When invoked, the server will respond with a plain text message 'hello world'. This route serves as the primary and only functional endpoint of the application.
     """
-    try:
-        res = await project.getHelloWorld_service.getHelloWorld(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getHelloWorld_service.getHelloWorld(request)
+    return res
 
 
 @app.get(
@@ -91,143 +273,145 @@ async def api_get_getHelloWorld(
     response_model=project.get_health_status_service.HealthCheckResponseModel,
 )
 async def api_get_get_health_status(
-    request: project.get_health_status_service.HealthCheckRequestModel,
-) -> project.get_health_status_service.HealthCheckResponseModel | Response:
+    request: project.get_health_status_service.HealthCheckRequestModel = Depends(),
+) -> project.get_health_status_service.HealthCheckResponseModel:
     """
     This endpoint serves as a health check for the app. When a GET request is made to this endpoint, it returns a plain text response 'hello world'. This indicates that the application is running properly. The route does not require any authentication and is accessible to anyone.
     """
-    try:
-        res = await project.get_health_status_service.get_health_status(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.get_health_status_service.get_health_status(request)
+    return res
+
+
+@app.get(
+    "/api/users",
+    response_model=project.listUsers_service.ListUsersResponse,
+    # Leaves out the fields the projection didn't select, but keeps a null next_cursor.
+    response_model_exclude_unset=True,
+    dependencies=[Depends(project.auth.require_admin)],
+)
+async def api_get_listUsers(
+    after: Optional[int] = None,
+    limit: int = 50,
+    role: Optional[project.listUsers_service.Role] = None,
+    email_prefix: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> project.listUsers_service.ListUsersResponse:
+    """
+    Lists users ordered by id with keyset pagination: pass the returned next_cursor as `after` to get the next page. Supports filtering on role and an email prefix, and a comma-separated `fields` projection (id, email, role, version). Requires an Admin token.
+    """
+    res = await project.listUsers_service.listUsers(
+        after,
+        limit,
+        role,
+        email_prefix,
+        fields.split(",") if fields else None,
+    )
+    return res
 
 
 @app.delete(
     "/api/users/{userId}",
     response_model=project.deleteUser_service.DeleteUserResponseModel,
+    dependencies=[Depends(project.auth.require_token)],
 )
 async def api_delete_deleteUser(
     id: int,
-) -> project.deleteUser_service.DeleteUserResponseModel | Response:
+) -> project.deleteUser_service.DeleteUserResponseModel:
     """
     Deletes a specific user by user ID. This endpoint requires an authenticated request with a valid JWT token and user authorization. Expected response is a success message on successful deletion.
     """
-    try:
-        res = await project.deleteUser_service.deleteUser(id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.deleteUser_service.deleteUser(id)
+    return res
 
 
 @app.put(
-    "/api/users/{userId}", response_model=project.updateUserDetails_service.UserResponse
+    "/api/users/{userId}",
+    response_model=project.updateUserDetails_service.UserResponse,
 )
 async def api_put_updateUserDetails(
     id: int,
     email: Optional[str],
     password: Optional[str],
     role: project.updateUserDetails_service.Role,
-) -> project.updateUserDetails_service.UserResponse | Response:
-    """
-    Updates details of a specific user by user ID. This endpoint accepts user attributes that need to be updated and requires an authenticated request with a valid JWT token. Expected response is the updated user details.
-    """
-    try:
-        res = await project.updateUserDetails_service.updateUserDetails(
-            id, email, password, role
-        )
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.post("/api/users/login", response_model=project.loginUser_service.LoginResponse)
+    version: Optional[int] = None,
+    claims: Dict[str, Any] = Depends(project.auth.require_token),
+) -> project.updateUserDetails_service.UserResponse:
+    """
+    Updates details of a specific user by user ID. This endpoint accepts user attributes that need to be updated and requires an authenticated request with a valid JWT token. Changing the role requires an Admin token; other callers get 403. Expected response is the updated user details.
+    """
+    res = await project.updateUserDetails_service.updateUserDetails(
+        id, email, password, role, version, project.auth.is_admin(claims)
+    )
+    return res
+
+
+@app.post(
+    "/api/users/login",
+    response_model=project.loginUser_service.LoginResponse,
+    dependencies=[Depends(project.rate_limit.login_throttle)],
+)
 async def api_post_loginUser(
     username: str, password: str
-) -> project.loginUser_service.LoginResponse | Response:
+) -> project.loginUser_service.LoginResponse:
+    """
+    Authenticates an existing user. This endpoint accepts username and password, and if valid, returns a JWT token for subsequent authenticated requests. Expected response is the JWT token and user details. Attempts are rate limited per client address and per account; over-limit attempts get 429 with Retry-After.
+    """
+    res = await project.loginUser_service.loginUser(username, password)
+    return res
+
+
+# Declared before /api/users/{userId}, which would otherwise match it.
+@app.get(
+    "/api/users/batch",
+    response_model=project.getUsersBatch_service.GetUsersBatchResponse,
+    dependencies=[Depends(project.auth.require_token)],
+)
+async def api_get_getUsersBatch(
+    ids: str,
+) -> project.getUsersBatch_service.GetUsersBatchResponse:
     """
-    Authenticates an existing user. This endpoint accepts username and password, and if valid, returns a JWT token for subsequent authenticated requests. Expected response is the JWT token and user details.
+    Fetches the profiles of several users at once, given a comma-separated list of up to 100 ids (`?ids=1,2,3`). Users are read with a single query rather than one per id. Requires an authenticated request with a valid JWT token. Expected response is the profiles found, in request order, and the ids that match no user.
     """
-    try:
-        res = await project.loginUser_service.loginUser(username, password)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getUsersBatch_service.getUsersBatch(
+        project.getUsersBatch_service.parse_ids(ids)
+    )
+    return res
 
 
 @app.get(
-    "/api/users/{userId}", response_model=project.getUserDetails_service.GetUserResponse
+    "/api/users/{userId}",
+    response_model=project.getUserDetails_service.GetUserResponse,
+    dependencies=[Depends(project.auth.require_token)],
 )
 async def api_get_getUserDetails(
     userId: int,
-) -> project.getUserDetails_service.GetUserResponse | Response:
+) -> project.getUserDetails_service.GetUserResponse:
     """
     Fetches details of a specific user by user ID. The endpoint requires an authenticated request with a valid JWT token. Expected response is the user’s profile data.
     """
-    try:
-        res = await project.getUserDetails_service.getUserDetails(userId)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.put("/users/:id", response_model=project.updateUser_service.UpdateUserResponse)
+    res = await project.getUserDetails_service.getUserDetails(userId)
+    return res
+
+
+@app.put(
+    "/users/:id",
+    response_model=project.updateUser_service.UpdateUserResponse,
+)
 async def api_put_updateUser(
     id: int,
     email: Optional[str],
     password: Optional[str],
     role: project.updateUser_service.Role,
-) -> project.updateUser_service.UpdateUserResponse | Response:
+    version: Optional[int] = None,
+    claims: Dict[str, Any] = Depends(project.auth.require_token),
+) -> project.updateUser_service.UpdateUserResponse:
     """
-    This endpoint updates the details of a specific user based on the provided user ID in the path parameter. It expects updated user details in the request body. Only authenticated users can access this endpoint.
+    This endpoint updates the details of a specific user based on the provided user ID in the path parameter. It expects updated user details in the request body. Only authenticated users can access this endpoint, and only Admin tokens may change the user's role; other callers get 403.
     """
-    try:
-        res = await project.updateUser_service.updateUser(id, email, password, role)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.updateUser_service.updateUser(
+        id, email, password, role, version, project.auth.is_admin(claims)
+    )
+    return res
 
 
 @app.get(
@@ -235,67 +419,28 @@ async def api_put_updateUser(
     response_model=project.checkHealth_service.HealthCheckResponseModel,
 )
 async def api_get_checkHealth(
-    request: project.checkHealth_service.HealthCheckRequestModel,
-) -> project.checkHealth_service.HealthCheckResponseModel | Response:
+    request: project.checkHealth_service.HealthCheckRequestModel = Depends(),
+) -> project.checkHealth_service.HealthCheckResponseModel:
     """
     Checks the health of the API service. This endpoint simply returns a 'healthy' status if the service is running properly. It interacts with the HealthCheckModule. Expected response is a JSON object indicating the service health status.
     """
-    try:
-        res = await project.checkHealth_service.checkHealth(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.get("/users/:id", response_model=project.getUser_service.GetUserResponseModel)
+    res = await project.checkHealth_service.checkHealth(request)
+    return res
+
+
+@app.get(
+    "/users/:id",
+    response_model=project.getUser_service.GetUserResponseModel,
+    dependencies=[Depends(project.auth.require_token)],
+)
 async def api_get_getUser(
     id: int,
-) -> project.getUser_service.GetUserResponseModel | Response:
+) -> project.getUser_service.GetUserResponseModel:
     """
     This endpoint retrieves the details of a specific user based on the provided user ID in the path parameter. It is a protected endpoint that requires a valid token for access.
     """
-    try:
-        res = await project.getUser_service.getUser(id)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.get(
-    "/api/docs", response_model=project.getDocumentation_service.ApiDocsResponseModel
-)
-async def api_get_getDocumentation(
-    request: project.getDocumentation_service.ApiDocsRequestModel,
-) -> project.getDocumentation_service.ApiDocsResponseModel | Response:
-    """
-    This endpoint provides documentation for the available API endpoints. Specifically, it explains the health check/hello world endpoint, detailing the path, method, expected response, and usage. This documentation aids users in understanding how to interact with the API.
-    """
-    try:
-        res = await project.getDocumentation_service.getDocumentation(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.getUser_service.getUser(id)
+    return res
 
 
 @app.get(
@@ -303,89 +448,26 @@ async def api_get_getDocumentation(
     response_model=project.sayHelloWorld_service.HelloWorldResponseModel,
 )
 async def api_get_sayHelloWorld(
-    request: project.sayHelloWorld_service.HelloWorldRequestModel,
-) -> project.sayHelloWorld_service.HelloWorldResponseModel | Response:
+    request: project.sayHelloWorld_service.HelloWorldRequestModel = Depends(),
+) -> project.sayHelloWorld_service.HelloWorldResponseModel:
     """
     Returns a simple 'hello world' message. This endpoint is the core feature of the 'hello world' app and is publicly accessible. Expected response is a plain text message: 'hello world'.
     """
-    try:
-        res = project.sayHelloWorld_service.sayHelloWorld(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = project.sayHelloWorld_service.sayHelloWorld(request)
+    return res
 
 
 @app.post("/users", response_model=project.createUser_service.CreateUserResponse)
 async def api_post_createUser(
-    email: str, password: str, role: project.createUser_service.Role
-) -> project.createUser_service.CreateUserResponse | Response:
+    email: str,
+    password: str,
+    role: project.createUser_service.Role,
+    claims: Optional[Dict[str, Any]] = Depends(project.auth.optional_token),
+) -> project.createUser_service.CreateUserResponse:
     """
-    This endpoint allows for the creation of a new user. It expects user details in the request body and returns the created user's information. Basic validation of input data should be performed here.
+    This endpoint allows for the creation of a new user. It expects user details in the request body and returns the created user's information. Basic validation of input data should be performed here. Creating an Admin user requires an Admin token; other callers get 403.
     """
-    try:
-        res = await project.createUser_service.createUser(email, password, role)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.post(
-    "/api/users/register",
-    response_model=project.registerUser_service.RegisterUserResponse,
-)
-async def api_post_registerUser(
-    username: str, password: str, email: str
-) -> project.registerUser_service.RegisterUserResponse | Response:
-    """
-    Registers a new user. This endpoint accepts user details like username, password, email, etc., and creates a new user record in the database. Expected response is a success message with the user's ID.
-    """
-    try:
-        res = await project.registerUser_service.registerUser(username, password, email)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
-
-
-@app.get(
-    "/api/documentation",
-    response_model=project.getAPIDocumentation_service.GetAPIDocumentationResponse,
-)
-async def api_get_getAPIDocumentation(
-    request: project.getAPIDocumentation_service.GetAPIDocumentationRequest,
-) -> project.getAPIDocumentation_service.GetAPIDocumentationResponse | Response:
-    """
-    Provides API documentation to the users. This route is used to fetch detailed API documentation, explaining how each endpoint works, their request and response formats, and expected behaviors. It interacts with the APIDocumentationModule. Expected response is a JSON object containing API documentation.
-    """
-    try:
-        res = await project.getAPIDocumentation_service.getAPIDocumentation(request)
-        return res
-    except Exception as e:
-        logger.exception("Error processing request")
-        res = dict()
-        res["error"] = str(e)
-        return Response(
-            content=jsonable_encoder(res),
-            status_code=500,
-            media_type="application/json",
-        )
+    res = await project.createUser_service.createUser(
+        email, password, role, project.auth.is_admin(claims)
+    )
+    return res
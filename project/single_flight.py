@@ -0,0 +1,139 @@
+import asyncio
+import functools
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+import project.metrics
+
+T = TypeVar("T")
+
+# "true" coalesces every group, "false" none, otherwise a comma-separated list of group names.
+SINGLE_FLIGHT = os.environ.get("SINGLE_FLIGHT", "true").lower()
+
+single_flight_calls = project.metrics.Counter(
+    "single_flight_calls_total",
+    "Calls to coalesced functions, by group. 1 - executions / calls is the coalescing ratio.",
+    ("group",),
+)
+single_flight_executions = project.metrics.Counter(
+    "single_flight_executions_total",
+    "Calls to coalesced functions that actually ran, rather than joined a call in flight, by group.",
+    ("group",),
+)
+
+
+def enabled(name: str) -> bool:
+    """
+    Tells whether coalescing is enabled for a group by SINGLE_FLIGHT.
+    """
+    if SINGLE_FLIGHT in ("1", "true", "yes"):
+        return True
+    if SINGLE_FLIGHT in ("0", "false", "no", ""):
+        return False
+    return name in {group.strip() for group in SINGLE_FLIGHT.split(",")}
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller starts the call, callers that
+    arrive while it is in flight await the same call, and all of them get its result or exception.
+    Once the call finishes the key is forgotten, so later callers start a new one.
+
+    The call runs in its own task, so a cancelled caller doesn't cancel it for the others; it is
+    only cancelled when every caller waiting for it has been cancelled.
+
+    Args:
+        name (str): The group name used in metrics.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._calls_counter = single_flight_calls.labels(name)
+        self._executions_counter = single_flight_executions.labels(name)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `fn`, or joins the call already in flight for `key`.
+
+        Args:
+            key (Hashable): Identifies calls that are interchangeable, e.g. the query arguments.
+            fn (Callable[[], Awaitable[T]]): Starts the call.
+
+        Returns:
+            T: The result of the shared call.
+
+        Example:
+            users = SingleFlight("user_by_id")
+            await asyncio.gather(*(users.do(1, lambda: find_user(1)) for _ in range(100)))
+            > [User(id=1, ...), ...]  # with a single find_user call
+        """
+        self._calls_counter.inc()
+        call = self._calls.get(key)
+        if call is None:
+            self._executions_counter.inc()
+            call = _Call(asyncio.get_running_loop().create_task(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda task: self._forget(key, call))
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Forget it now rather than when the task finishes cancelling, so a caller
+                # arriving meanwhile starts a new call instead of joining the cancelled one.
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+def coalesce(
+    name: str, key: Optional[Callable[..., Hashable]] = None
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Decorates an async function so concurrent calls with the same arguments share one execution,
+    unless SINGLE_FLIGHT disables the group.
+
+    Args:
+        name (str): The group name, used by SINGLE_FLIGHT and in metrics.
+        key (Optional[Callable[..., Hashable]]): Computes the coalescing key from the call's
+            arguments. Defaults to the arguments themselves.
+
+    Returns:
+        Callable: The decorator.
+
+    Example:
+        @coalesce("user_by_id")
+        async def find_user(id: int) -> Optional[prisma.models.User]:
+            return await prisma.models.User.prisma().find_unique(where={"id": id})
+    """
+
+    def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        if not enabled(name):
+            return fn
+        group = SingleFlight(name)
+
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            call_key = (
+                key(*args, **kwargs)
+                if key is not None
+                else (args, tuple(sorted(kwargs.items())))
+            )
+            return await group.do(call_key, lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -2,7 +2,11 @@ from enum import Enum
 from typing import Optional
 
 import prisma
+import prisma.errors
 import prisma.models
+import project.errors
+import project.password_hashing
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -11,8 +15,8 @@ class Role(Enum):
     Enum representing user roles.
     """
 
-    Admin: str
-    User: str
+    Admin = "Admin"
+    User = "User"
 
 
 class UserResponse(BaseModel):
@@ -23,10 +27,16 @@ class UserResponse(BaseModel):
     id: int
     email: str
     role: Role
+    version: int
 
 
 async def updateUserDetails(
-    id: int, email: Optional[str], password: Optional[str], role: Role
+    id: int,
+    email: Optional[str],
+    password: Optional[str],
+    role: Role,
+    version: Optional[int] = None,
+    admin: bool = False,
 ) -> UserResponse:
     """
     Updates details of a specific user by user ID. This endpoint accepts user attributes that need to be updated and requires an authenticated request with a valid JWT token. Expected response is the updated user details.
@@ -36,30 +46,59 @@ async def updateUserDetails(
     email (Optional[str]): The new email for the user. This field should be unique.
     password (Optional[str]): The new password for the user.
     role (Role): The new role for the user. It should be one of the predefined roles (Admin/User).
+    version (Optional[int]): The version the caller last read. If given, the update only applies if the user was not modified since.
+    admin (bool): Whether the caller holds an Admin token, which is required to change the user's role.
 
     Returns:
     UserResponse: Response model for the updated user details.
 
+    Raises:
+    NotFoundError: If no user with the given ID exists.
+    ConflictError: If the email is taken by another user or the version is stale.
+    ForbiddenError: If a caller without an Admin token asks for a different role.
+
     Example:
         await updateUserDetails(1, "newemail@example.com", "newpassword", Role.User)
         > UserResponse(
             id=1,
             email="newemail@example.com",
-            role=Role.User
+            role=Role.User,
+            version=1
         )
     """
-    user = await prisma.models.User.prisma().find_unique(where={"id": id})
-    if not user:
-        raise ValueError(f"User with ID {id} does not exist")
     user_data = {}
     if email:
         user_data["email"] = email
     if password:
-        user_data["password"] = password
+        user_data["password"] = await project.password_hashing.hash_password(password)
     user_data["role"] = role.name
-    updated_user = await prisma.models.User.prisma().update(
-        where={"id": id}, data=user_data
-    )
+    user_data["version"] = {"increment": 1}
+    where = {"id": id} if version is None else {"id": id, "version": version}
+    if not admin:
+        # Only applies if the role is already the requested one.
+        where["role"] = role.name
+    try:
+        updated_user = await prisma.models.User.prisma().update(
+            where=where, data=user_data
+        )
+    except prisma.errors.UniqueViolationError:
+        raise project.errors.ConflictError(f"Email {email} is already in use")
+    if not updated_user:
+        # Only the failure path pays for a second query, to tell why the update didn't apply.
+        current = await prisma.models.User.prisma().find_unique(where={"id": id})
+        if current is None:
+            raise project.errors.NotFoundError(f"User with ID {id} does not exist")
+        if not admin and Role(current.role) is not role:
+            raise project.errors.ForbiddenError(
+                "Changing a user's role requires an Admin token"
+            )
+        raise project.errors.ConflictError(
+            f"User with ID {id} was modified since version {version}"
+        )
+    await project.user_cache.user_cache.put(updated_user)
     return UserResponse(
-        id=updated_user.id, email=updated_user.email, role=Role(updated_user.role)
+        id=updated_user.id,
+        email=updated_user.email,
+        role=Role(updated_user.role),
+        version=updated_user.version,
     )
@@ -2,7 +2,11 @@ from enum import Enum
 from typing import Optional
 
 import prisma
+import prisma.errors
 import prisma.models
+import project.errors
+import project.password_hashing
+import project.user_cache
 from pydantic import BaseModel
 
 
@@ -11,8 +15,8 @@ class Role(Enum):
     Enum representing user roles.
     """
 
-    Admin: str
-    User: str
+    Admin = "Admin"
+    User = "User"
 
 
 class UpdateUserResponse(BaseModel):
@@ -22,12 +26,17 @@ class UpdateUserResponse(BaseModel):
 
     id: int
     email: str
-    password: str
     role: Role
+    version: int
 
 
 async def updateUser(
-    id: int, email: Optional[str], password: Optional[str], role: Role
+    id: int,
+    email: Optional[str],
+    password: Optional[str],
+    role: Role,
+    version: Optional[int] = None,
+    admin: bool = False,
 ) -> UpdateUserResponse:
     """
     This endpoint updates the details of a specific user based on the provided user ID in the path parameter.
@@ -38,36 +47,59 @@ async def updateUser(
         email (Optional[str]): The new email for the user. This field should be unique.
         password (Optional[str]): The new password for the user.
         role (Role): The new role for the user. It should be one of the predefined roles (Admin/User).
+        version (Optional[int]): The version the caller last read. If given, the update only applies if the user was not modified since.
+        admin (bool): Whether the caller holds an Admin token, which is required to change the user's role.
 
     Returns:
         UpdateUserResponse: The response model for updating a user. It returns the updated user details.
 
+    Raises:
+        NotFoundError: If no user with the given ID exists.
+        ConflictError: If the email is taken by another user or the version is stale.
+        ForbiddenError: If a caller without an Admin token asks for a different role.
+
     Example:
         updateUser(1, "new_email@example.com", "new_password", Role.Admin)
-        > UpdateUserResponse(id=1, email="new_email@example.com", password="new_password", role=Role.Admin)
+        > UpdateUserResponse(id=1, email="new_email@example.com", role=Role.Admin, version=1)
     """
     data_to_update = {}
     if email:
-        existing_user = await prisma.models.User.prisma().find_first(
-            where={"email": email}
-        )
-        if existing_user and existing_user.id != id:
-            raise ValueError("Email already exists.")
         data_to_update["email"] = email
     if password:
-        data_to_update["password"] = password
+        data_to_update["password"] = await project.password_hashing.hash_password(
+            password
+        )
     if role is not None:
         data_to_update["role"] = role.value
     if not data_to_update:
-        raise ValueError("No data provided to update the user.")
-    updated_user = await prisma.models.User.prisma().update(
-        where={"id": id}, data=data_to_update
-    )
+        raise project.errors.InvalidRequestError("No data provided to update the user.")
+    data_to_update["version"] = {"increment": 1}
+    where = {"id": id} if version is None else {"id": id, "version": version}
+    if role is not None and not admin:
+        # Only applies if the role is already the requested one.
+        where["role"] = role.value
+    try:
+        updated_user = await prisma.models.User.prisma().update(
+            where=where, data=data_to_update
+        )
+    except prisma.errors.UniqueViolationError:
+        raise project.errors.ConflictError("Email already exists.")
     if not updated_user:
-        raise ValueError("Failed to update the user.")
+        # Only the failure path pays for a second query, to tell why the update didn't apply.
+        current = await prisma.models.User.prisma().find_unique(where={"id": id})
+        if current is None:
+            raise project.errors.NotFoundError(f"User with ID {id} does not exist")
+        if role is not None and not admin and Role(current.role) is not role:
+            raise project.errors.ForbiddenError(
+                "Changing a user's role requires an Admin token"
+            )
+        raise project.errors.ConflictError(
+            f"User with ID {id} was modified since version {version}"
+        )
+    await project.user_cache.user_cache.put(updated_user)
     return UpdateUserResponse(
         id=updated_user.id,
         email=updated_user.email,
-        password=updated_user.password,
         role=Role(updated_user.role),
+        version=updated_user.version,
     )
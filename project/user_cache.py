@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+import project.database
+import project.metrics
+import project.single_flight
+import project.user_loader
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "60"))
+
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "10000"))
+
+USER_CACHE_REDIS_URL = os.environ.get("USER_CACHE_REDIS_URL")
+
+user_cache_hits = project.metrics.Counter(
+    "user_cache_hits_total", "User lookups served from the cache, by key.", ("key",)
+)
+user_cache_misses = project.metrics.Counter(
+    "user_cache_misses_total", "User lookups that fell through to the database."
+)
+user_cache_invalidations = project.metrics.Counter(
+    "user_cache_invalidations_total", "User cache entries dropped by writes."
+)
+user_cache_entry_age_seconds = project.metrics.Histogram(
+    "user_cache_entry_age_seconds",
+    "Age of user cache entries when they are served, i.e. their potential staleness.",
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+
+class CachedUser(BaseModel):
+    """
+    The cached projection of a User row. It deliberately has no password field.
+    """
+
+    id: int
+    email: str
+    role: str
+    version: int
+    cached_at: float
+
+
+class UserCacheBackend(Protocol):
+    """
+    Storage used by UserCache. Implementations must expire entries after `ttl` seconds.
+    """
+
+    async def get(self, key: str) -> Optional[CachedUser]: ...
+
+    async def set(self, key: str, value: CachedUser, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+
+class LocalUserCacheBackend:
+    """
+    Per-process LRU backend. Entries are not shared between workers, so cross-worker staleness is
+    bounded by the TTL.
+    """
+
+    def __init__(self, maxsize: int = USER_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, CachedUser]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[CachedUser]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: CachedUser, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class RedisUserCacheBackend:
+    """
+    Redis backend shared by all workers, so a write on one worker is visible to the others.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "users:") -> None:
+        import redis.asyncio
+
+        self._redis = redis.asyncio.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[CachedUser]:
+        raw = await self._redis.get(self._prefix + key)
+        return CachedUser.model_validate_json(raw) if raw is not None else None
+
+    async def set(self, key: str, value: CachedUser, ttl: float) -> None:
+        await self._redis.set(
+            self._prefix + key, value.model_dump_json(), px=int(ttl * 1000)
+        )
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._redis.delete(*(self._prefix + key for key in keys))
+
+
+class UserCache:
+    """
+    Read-through, write-invalidated cache of User rows keyed by id.
+
+    A load that overlaps a write of the same user may have read the row as it was before the
+    write, so its result is returned but not cached; across workers, a cached entry is only
+    replaced by a read of the same or a later version.
+
+    Args:
+        backend (UserCacheBackend): Where entries are stored.
+        ttl_seconds (float): How long an entry may be served before it is reloaded.
+    """
+
+    def __init__(
+        self, backend: UserCacheBackend, ttl_seconds: float = USER_CACHE_TTL_SECONDS
+    ) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        # For each user id being loaded: [loads in flight, writes seen since the first started].
+        self._loading: Dict[int, List[int]] = {}
+
+    async def get_by_id(self, id: int) -> Optional[CachedUser]:
+        """
+        Returns the user with the given id, loading it from the database on a miss.
+
+        Args:
+            id (int): The user id.
+
+        Returns:
+            Optional[CachedUser]: The user, or None if no such user exists.
+
+        Example:
+            user = await user_cache.get_by_id(1)
+            > CachedUser(id=1, email='john.doe@example.com', role='User', version=0, cached_at=...)
+        """
+        cached = await self._lookup(f"id:{id}", "id")
+        if cached is not None:
+            return cached
+        return await self._load_by_id(id)
+
+    async def get_many(self, ids: List[int]) -> List[Optional[CachedUser]]:
+        """
+        Returns the users with the given ids, in order. The misses are loaded together, with a
+        single batched query.
+
+        Args:
+            ids (List[int]): The user ids.
+
+        Returns:
+            List[Optional[CachedUser]]: The users, None for ids with no user.
+
+        Example:
+            users = await user_cache.get_many([1, 2, 404])
+            > [CachedUser(id=1, ...), CachedUser(id=2, ...), None]
+        """
+        users = list(
+            await asyncio.gather(*(self._lookup(f"id:{id}", "id") for id in ids))
+        )
+        misses = [index for index, user in enumerate(users) if user is None]
+        loaded = await asyncio.gather(
+            *(self._load_by_id(ids[index]) for index in misses)
+        )
+        for index, user in zip(misses, loaded):
+            users[index] = user
+        return users
+
+    async def put(self, user: Any, written: bool = True) -> CachedUser:
+        """
+        Stores a freshly written or read User row. A read row doesn't replace an entry with a higher
+        version. Written rows are also read from the primary for a while, rather than from a
+        replica that may not have them yet.
+
+        Args:
+            user (prisma.models.User): The row as returned by Prisma.
+            written (bool): Whether the row was just written, rather than read.
+
+        Returns:
+            CachedUser: The cached projection of the row.
+        """
+        entry = self._entry(user)
+        if written:
+            self._note_write(entry.id)
+            project.database.pin_to_primary(f"user:{entry.id}", f"email:{entry.email}")
+        try:
+            if not written:
+                previous = await self.backend.get(f"id:{entry.id}")
+                if previous is not None and previous.version > entry.version:
+                    return previous
+            await self.backend.set(f"id:{entry.id}", entry, self.ttl_seconds)
+        except Exception:
+            logger.warning("User cache backend write failed", exc_info=True)
+        return entry
+
+    async def invalidate(self, id: int, email: Optional[str] = None) -> None:
+        """
+        Drops a user's entry, e.g. after it was deleted.
+
+        Args:
+            id (int): The user id.
+            email (Optional[str]): The user's email, if known, so login reads it from the primary.
+        """
+        self._note_write(id)
+        if email is not None:
+            project.database.pin_to_primary(f"user:{id}", f"email:{email}")
+        else:
+            project.database.pin_to_primary(f"user:{id}")
+        try:
+            await self.backend.delete(f"id:{id}")
+        except Exception:
+            # Entries left behind expire after the TTL.
+            logger.warning("User cache backend invalidation failed", exc_info=True)
+        user_cache_invalidations.inc()
+
+    # Concurrent misses for the same user share one query (and one cache write), and misses for
+    # different users in the same event loop iteration are fetched together by the user loader.
+    @project.single_flight.coalesce("user_by_id")
+    async def _load_by_id(self, id: int) -> Optional[CachedUser]:
+        loading = self._loading.setdefault(id, [0, 0])
+        loading[0] += 1
+        writes = loading[1]
+        try:
+            user = await project.user_loader.user_loader.load(id)
+        finally:
+            loading[0] -= 1
+            if not loading[0]:
+                del self._loading[id]
+        if user is None:
+            return None
+        if loading[1] != writes:
+            # The user was written while we read it: our row may predate the cached one.
+            return self._entry(user)
+        return await self.put(user, written=False)
+
+    def _note_write(self, id: int) -> None:
+        loading = self._loading.get(id)
+        if loading is not None:
+            loading[1] += 1
+
+    @staticmethod
+    def _entry(user: Any) -> CachedUser:
+        return CachedUser(
+            id=user.id,
+            email=user.email,
+            role=str(user.role),
+            version=user.version,
+            cached_at=time.time(),
+        )
+
+    async def _lookup(self, key: str, kind: str) -> Optional[CachedUser]:
+        try:
+            cached = await self.backend.get(key)
+        except Exception:
+            logger.warning("User cache backend lookup failed", exc_info=True)
+            cached = None
+        if cached is None:
+            user_cache_misses.inc()
+            return None
+        user_cache_hits.labels(kind).inc()
+        user_cache_entry_age_seconds.observe(time.time() - cached.cached_at)
+        return cached
+
+
+def _make_backend() -> UserCacheBackend:
+    if USER_CACHE_REDIS_URL:
+        return RedisUserCacheBackend(USER_CACHE_REDIS_URL)
+    return LocalUserCacheBackend()
+
+
+user_cache = UserCache(_make_backend())
@@ -0,0 +1,123 @@
+import asyncio
+import contextvars
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import prisma
+import prisma.models
+import project.database
+import project.metrics
+
+# 0 batches the lookups issued in the same event loop iteration; a positive value also waits that
+# long for more.
+USER_LOADER_WINDOW_SECONDS = float(os.environ.get("USER_LOADER_WINDOW_SECONDS", "0"))
+
+USER_LOADER_MAX_BATCH = int(os.environ.get("USER_LOADER_MAX_BATCH", "500"))
+
+user_loader_batches = project.metrics.Counter(
+    "user_loader_batches_total",
+    "Batched user queries issued by the user loader.",
+)
+user_loader_batch_size = project.metrics.Histogram(
+    "user_loader_batch_size",
+    "Distinct user ids fetched per batched query.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+
+
+class UserLoader:
+    """
+    Batches user lookups by id: ids requested while a batch is pending are fetched together with a
+    single `find_many(where={"id": {"in": [...]}})`, and each caller gets its own row (or None).
+    A batch is dispatched on the next event loop iteration, or `window_seconds` after its first id.
+
+    Every caller awaits a shielded future, so one cancelled caller doesn't cancel the lookup for
+    the others asking for the same id. Lookups that must read their own writes are batched apart
+    and always read from the primary.
+
+    Args:
+        window_seconds (float): How long a batch waits for more ids.
+        max_batch (int): The most ids fetched by one query; larger batches are split.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = USER_LOADER_WINDOW_SECONDS,
+        max_batch: int = USER_LOADER_MAX_BATCH,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_batch = max(max_batch, 1)
+        self._pending: Dict[Tuple[bool, int], asyncio.Future] = {}
+
+    async def load(self, id: int) -> Optional[prisma.models.User]:
+        """
+        Returns the user with the given id, fetched in the current batch.
+
+        Args:
+            id (int): The user id.
+
+        Returns:
+            Optional[prisma.models.User]: The row, or None if no such user exists.
+
+        Example:
+            await asyncio.gather(user_loader.load(1), user_loader.load(2))
+            > [User(id=1, ...), User(id=2, ...)]  # with a single find_many
+        """
+        return await asyncio.shield(self._future(id))
+
+    def _future(self, id: int) -> asyncio.Future:
+        key = (project.database.needs_primary(f"user:{id}"), id)
+        future = self._pending.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        if not self._pending:
+            # The batch serves many requests, so it doesn't run in the context of the first one.
+            context = contextvars.Context()
+            if self.window_seconds > 0:
+                loop.call_later(self.window_seconds, self._dispatch, context=context)
+            else:
+                loop.call_soon(self._dispatch, context=context)
+        future = self._pending[key] = loop.create_future()
+        return future
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        loop = asyncio.get_running_loop()
+        for primary in (False, True):
+            ids = [id for on_primary, id in pending if on_primary is primary]
+            for start in range(0, len(ids), self.max_batch):
+                chunk = {
+                    id: pending[primary, id]
+                    for id in ids[start : start + self.max_batch]
+                }
+                loop.create_task(self._fetch(chunk, primary))
+
+    async def _fetch(self, batch: Dict[int, asyncio.Future], primary: bool) -> None:
+        user_loader_batches.inc()
+        user_loader_batch_size.observe(len(batch))
+        ids = list(batch)
+        try:
+            users: Any = await project.database.run_read(
+                "user_by_id",
+                lambda client: prisma.models.User.prisma(client).find_many(
+                    where={"id": {"in": ids}}
+                ),
+                primary=primary,
+            )
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        found = {user.id: user for user in users}
+        for id, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(id))
+
+
+user_loader = UserLoader()
@@ -0,0 +1,148 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+import project.metrics
+
+T = TypeVar("T")
+
+HASH_POOL_KIND = os.environ.get("HASH_POOL_KIND", "thread")
+
+HASH_POOL_MAX_WORKERS = int(
+    os.environ.get("HASH_POOL_MAX_WORKERS", str(os.cpu_count() or 1))
+)
+
+HASH_POOL_MAX_QUEUE = int(os.environ.get("HASH_POOL_MAX_QUEUE", "64"))
+
+HASH_POOL_RETRY_AFTER_SECONDS = int(
+    os.environ.get("HASH_POOL_RETRY_AFTER_SECONDS", "1")
+)
+
+pool_running = project.metrics.Gauge(
+    "worker_pool_running", "Jobs currently executing in a worker pool.", ("pool",)
+)
+pool_queued = project.metrics.Gauge(
+    "worker_pool_queued", "Jobs waiting for a free worker.", ("pool",)
+)
+pool_completed = project.metrics.Counter(
+    "worker_pool_completed_total", "Jobs finished by a worker pool.", ("pool",)
+)
+pool_rejected = project.metrics.Counter(
+    "worker_pool_rejected_total",
+    "Jobs shed because the worker pool queue was full.",
+    ("pool",),
+)
+
+
+class PoolSaturatedError(Exception):
+    """
+    Raised when a worker pool already has as many queued jobs as it accepts.
+    """
+
+    def __init__(self, pool: str, retry_after: int) -> None:
+        super().__init__(f"The {pool} worker pool is saturated, retry later")
+        self.retry_after = retry_after
+
+
+class BoundedWorkerPool:
+    """
+    Runs blocking, CPU-bound calls off the event loop on a thread or process pool.
+
+    At most `max_workers` jobs run at once and at most `max_queue` more wait for a worker; further
+    submissions are shed immediately with PoolSaturatedError instead of growing an unbounded backlog.
+    Threads are enough for C extensions that release the GIL (such as bcrypt); use processes for
+    pure-Python work.
+
+    Args:
+        name (str): The pool name used in metric labels.
+        kind (str): Either 'thread' or 'process'.
+        max_workers (int): The concurrency cap.
+        max_queue (int): How many jobs may wait for a worker before new ones are rejected.
+        retry_after (int): The Retry-After hint, in seconds, carried by PoolSaturatedError.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "thread",
+        max_workers: int = 1,
+        max_queue: int = 0,
+        retry_after: int = 1,
+    ) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool kind: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._running = pool_running.labels(name)
+        self._queued = pool_queued.labels(name)
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self._pending - self.max_workers, 0)
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        """
+        Runs `fn(*args)` on the pool and awaits its result.
+
+        Args:
+            fn (Callable[..., T]): The blocking function. Must be picklable for process pools.
+            *args: Positional arguments for `fn`.
+
+        Returns:
+            T: The function's return value.
+
+        Raises:
+            PoolSaturatedError: If the pool's queue is already full.
+
+        Example:
+            ok = await hash_pool.run(bcrypt.checkpw, b"secret", hashed)
+            > True
+        """
+        if self._pending >= self.max_workers + self.max_queue:
+            pool_rejected.labels(self.name).inc()
+            raise PoolSaturatedError(self.name, self.retry_after)
+        self._pending += 1
+        self._update_gauges()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), fn, *args
+            )
+        finally:
+            self._pending -= 1
+            self._update_gauges()
+            pool_completed.labels(self.name).inc()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        # Created lazily so that importing this module never forks processes or spawns threads.
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+        return self._executor
+
+    def _update_gauges(self) -> None:
+        self._running.set(min(self._pending, self.max_workers))
+        self._queued.set(self.queue_depth)
+
+
+hash_pool = BoundedWorkerPool(
+    "hash",
+    kind=HASH_POOL_KIND,
+    max_workers=HASH_POOL_MAX_WORKERS,
+    max_queue=HASH_POOL_MAX_QUEUE,
+    retry_after=HASH_POOL_RETRY_AFTER_SECONDS,
+)
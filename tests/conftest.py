@@ -0,0 +1,18 @@
+import benchmarks.memory_db
+import project.user_cache
+import pytest
+
+
+@pytest.fixture
+def memory_db(monkeypatch):
+    """
+    Serves the app's Prisma calls from an empty in-memory database, with an empty user cache.
+    """
+    monkeypatch.setattr(
+        project.user_cache.user_cache,
+        "backend",
+        project.user_cache.LocalUserCacheBackend(),
+    )
+    restore = benchmarks.memory_db.install(benchmarks.memory_db.MemoryDatabase())
+    yield
+    restore()
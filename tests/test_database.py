@@ -0,0 +1,32 @@
+import asyncio
+
+import project.database
+
+
+def test_background_connect_retries_until_it_succeeds(monkeypatch):
+    engine = {"started": False}
+    attempts = []
+    prepared = []
+
+    async def connect():
+        attempts.append(engine["started"])
+        engine["started"] = True
+        if len(attempts) < 3:
+            raise ConnectionError("the database is starting")
+
+    async def disconnect():
+        engine["started"] = False
+
+    async def prepare_pool():
+        prepared.append(True)
+
+    client = project.database.db_client
+    monkeypatch.setattr(client, "connect", connect)
+    monkeypatch.setattr(client, "disconnect", disconnect)
+    monkeypatch.setattr(client, "is_connected", lambda: engine["started"])
+    monkeypatch.setattr(project.database, "_prepare_pool", prepare_pool)
+    monkeypatch.setattr(project.database, "DB_CONNECT_RETRY_MAX_SECONDS", 0.01)
+    asyncio.run(project.database._connect_in_background())
+    # Every attempt starts with a fresh query engine, and the pool is prepared once connected.
+    assert attempts == [False, False, False]
+    assert prepared == [True]
@@ -0,0 +1,38 @@
+import asyncio
+
+import project.database
+import project.docs_registry
+import project.server
+
+
+def test_overrides_are_retried_after_a_failed_load(memory_db, monkeypatch):
+    run_read = project.database.run_read
+    reads = []
+
+    async def fail_once(*args, **kwargs):
+        reads.append(True)
+        if len(reads) == 1:
+            raise ConnectionError("database unavailable")
+        return await run_read(*args, **kwargs)
+
+    monkeypatch.setattr(project.database, "run_read", fail_once)
+    registry = project.docs_registry.DocsRegistry(project.server.app.router.routes)
+
+    async def run():
+        monkeypatch.setattr(project.docs_registry, "DOCS_RETRY_SECONDS", 60)
+        await registry.get()
+        failed = (registry.built, registry.override("/health-check"))
+        endpoints = len(registry.endpoints)
+        await registry.get()
+        reads_before_retry = len(reads)
+        registry._retry_at = 0  # the retry delay has passed
+        await registry.get()
+        return failed, endpoints, reads_before_retry
+
+    failed, endpoints, reads_before_retry = asyncio.run(run())
+    # Served without overrides, and not reloaded before the retry delay.
+    assert failed == (False, None)
+    assert endpoints > 0
+    assert reads_before_retry == 1
+    assert registry.built
+    assert registry.override("/health-check").response == "hello world"
@@ -0,0 +1,39 @@
+import asyncio
+
+import benchmarks.load_test
+import httpx
+import project.loginUser_service
+import project.server
+
+
+async def request(method: str, path: str, token: str = "", **params) -> httpx.Response:
+    transport = httpx.ASGITransport(app=project.server.app)
+    headers = {"authorization": f"Bearer {token}"} if token else {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, path, params=params, headers=headers)
+
+
+def test_errors_share_the_error_body(memory_db):
+    async def run():
+        fixture = benchmarks.load_test.Fixture(1)
+        await fixture.seed()
+        user = await project.loginUser_service.loginUser(
+            f"{fixture.prefix}user0-0@example.com", benchmarks.load_test.PASSWORD
+        )
+        return (
+            await request("GET", "/api/users"),
+            await request("GET", "/api/users", "not-a-jwt"),
+            await request("GET", "/api/users", user.token),
+            await request("DELETE", "/api/users/404", fixture.token, id=404),
+        )
+
+    anonymous, invalid, not_admin, missing = asyncio.run(run())
+    assert anonymous.status_code == 401
+    assert anonymous.headers["www-authenticate"] == "Bearer"
+    assert anonymous.json() == {"error": "Not authenticated"}
+    assert invalid.status_code == 401
+    assert invalid.json()["error"].startswith("Invalid token")
+    assert not_admin.status_code == 403
+    assert not_admin.json() == {"error": "Admin role required"}
+    assert missing.status_code == 404
+    assert missing.json() == {"error": "User with ID 404 does not exist"}
@@ -0,0 +1,28 @@
+import asyncio
+
+import httpx
+import project.server
+import pytest
+
+pytest.importorskip("msgpack")
+
+
+@pytest.mark.parametrize("accept", ["application/json", "application/msgpack"])
+def test_not_modified_varies_like_ok(memory_db, accept):
+    async def run():
+        transport = httpx.ASGITransport(app=project.server.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            ok = await client.get("/hello", headers={"accept": accept})
+            not_modified = await client.get(
+                "/hello",
+                headers={"accept": accept, "if-none-match": ok.headers["etag"]},
+            )
+        return ok, not_modified
+
+    # JSON is served by the fast path, MessagePack by the route stack.
+    ok, not_modified = asyncio.run(run())
+    assert ok.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.headers["vary"] == ok.headers["vary"] == "Accept"
@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+
+import prisma.models
+import project.importUsers_service
+import project.password_hashing
+import project.worker_pool
+
+
+def test_rows_taken_during_the_import_are_reported(memory_db, monkeypatch):
+    async def hash_password(password: str) -> str:
+        if password == "racing":
+            # Another writer creates this row after the batch's existence check.
+            await prisma.models.User.prisma().create(
+                data={"email": "b@example.com", "password": "theirs"}
+            )
+        return uuid.uuid4().hex
+
+    monkeypatch.setattr(project.password_hashing, "hash_password", hash_password)
+    body = (
+        b'{"email": "a@example.com", "password": "secret"}\n'
+        b'{"email": "b@example.com", "password": "secret"}\n'
+        b'{"email": "c@example.com", "password": "racing"}\n'
+    )
+
+    async def chunks():
+        yield body
+
+    response = asyncio.run(
+        project.importUsers_service.importUsers(chunks(), "application/x-ndjson")
+    )
+    assert response.created == 2
+    assert response.failed == 1
+    assert [(error.line, error.email) for error in response.errors] == [
+        (2, "b@example.com")
+    ]
+
+
+def test_import_survives_a_saturated_hash_pool(memory_db, monkeypatch):
+    attempts = {}
+
+    async def hash_password(password: str) -> str:
+        attempts[password] = attempts.get(password, 0) + 1
+        # "busy" is shed once then hashed; "stuck" is shed every time.
+        if password == "stuck" or attempts[password] == 1 and password == "busy":
+            raise project.worker_pool.PoolSaturatedError("hash", 1)
+        return uuid.uuid4().hex
+
+    monkeypatch.setattr(project.password_hashing, "hash_password", hash_password)
+    monkeypatch.setattr(project.importUsers_service, "BULK_IMPORT_HASH_RETRIES", 2)
+    body = (
+        b'{"email": "a@example.com", "password": "busy"}\n'
+        b'{"email": "b@example.com", "password": "stuck"}\n'
+        b'{"email": "c@example.com", "password": "free"}\n'
+    )
+
+    async def chunks():
+        yield body
+
+    response = asyncio.run(
+        project.importUsers_service.importUsers(chunks(), "application/x-ndjson")
+    )
+    assert response.created == 2
+    assert [(error.line, error.email) for error in response.errors] == [
+        (2, "b@example.com")
+    ]
+    assert attempts == {"busy": 2, "stuck": 3, "free": 1}
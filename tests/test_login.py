@@ -0,0 +1,50 @@
+import asyncio
+
+import prisma.models
+import project.loginUser_service
+import project.password_hashing
+import project.user_cache
+
+
+def test_rehash_on_login_does_not_undo_a_password_change(memory_db, monkeypatch):
+    async def run():
+        old = await project.password_hashing.hash_password("old", rounds=4)
+        user = await prisma.models.User.prisma().create(
+            data={"email": "a@example.com", "password": old}
+        )
+        await project.user_cache.user_cache.get_by_id(user.id)
+        changed = False
+        hash_password = project.password_hashing.hash_password
+
+        async def change_during_rehash(password: str, rounds=None) -> str:
+            # The password is changed while the login computes the upgraded hash.
+            if changed:
+                await prisma.models.User.prisma().update(
+                    where={"id": user.id},
+                    data={"password": "changed", "version": {"increment": 1}},
+                )
+            return await hash_password(password, rounds)
+
+        monkeypatch.setattr(
+            project.password_hashing, "hash_password", change_during_rehash
+        )
+        await project.loginUser_service.loginUser("a@example.com", "old")
+        row = await prisma.models.User.prisma().find_unique(where={"id": user.id})
+        upgraded = (row.password, row.version)
+        cached = await project.user_cache.user_cache.get_by_id(user.id)
+
+        changed = True
+        await prisma.models.User.prisma().update(
+            where={"id": user.id}, data={"password": old}
+        )
+        await project.loginUser_service.loginUser("a@example.com", "old")
+        final = await prisma.models.User.prisma().find_unique(where={"id": user.id})
+        return upgraded, cached, final
+
+    upgraded, cached, final = asyncio.run(run())
+    # A plain login upgrades the hash as a versioned write the cache sees.
+    assert project.password_hashing.needs_rehash(upgraded[0]) is False
+    assert upgraded[1] == 1
+    assert cached.version == 1
+    # A rehash racing a password change leaves the new password alone.
+    assert final.password == "changed"
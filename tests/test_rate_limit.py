@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+import project.rate_limit
+import project.server
+import uvicorn
+
+# The Cloud Run front end connects from a link-local address and appends the client's address to
+# X-Forwarded-For.
+PROXY = "169.254.8.129"
+
+
+def behind_proxy():
+    config = uvicorn.Config(
+        project.server.app, proxy_headers=True, forwarded_allow_ips="169.254.0.0/16"
+    )
+    config.load()
+    return config.loaded_app
+
+
+async def login(app, forwarded_for: str) -> int:
+    transport = httpx.ASGITransport(app=app, client=(PROXY, 40000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/users/login",
+            params={"username": "nobody@example.com", "password": "wrong"},
+            headers={"x-forwarded-for": forwarded_for},
+        )
+    return response.status_code
+
+
+def test_login_limit_is_per_forwarded_client(memory_db, monkeypatch):
+    monkeypatch.setattr(project.rate_limit, "LOGIN_RATE_LIMIT_PER_IP", 2)
+    monkeypatch.setattr(project.rate_limit, "LOGIN_RATE_LIMIT_PER_ACCOUNT", 0)
+    monkeypatch.setattr(
+        project.rate_limit.rate_limiter,
+        "backend",
+        project.rate_limit.LocalRateLimitBackend(),
+    )
+    app = behind_proxy()
+
+    async def run():
+        attacker = [await login(app, "203.0.113.7") for _ in range(3)]
+        # Same proxy, another client: not affected by the attacker's bucket.
+        other = await login(app, "198.51.100.9")
+        # The attacker can't pick a fresh bucket by sending its own X-Forwarded-For, since the
+        # proxy appends the real address after it.
+        spoofed = await login(app, "192.0.2.1, 203.0.113.7")
+        return attacker, other, spoofed
+
+    attacker, other, spoofed = asyncio.run(run())
+    assert attacker == [401, 401, 429]
+    assert other == 401
+    assert spoofed == 429
@@ -0,0 +1,103 @@
+import asyncio
+
+import benchmarks.load_test
+import httpx
+import prisma.models
+import project.loginUser_service
+import project.server
+
+
+async def request(method: str, path: str, token: str = "", **params) -> int:
+    transport = httpx.ASGITransport(app=project.server.app)
+    headers = {"authorization": f"Bearer {token}"} if token else {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.request(method, path, params=params, headers=headers)
+    return response.status_code
+
+
+def test_only_admins_grant_the_admin_role(memory_db):
+    async def run():
+        fixture = benchmarks.load_test.Fixture(1)
+        await fixture.seed()
+        email = f"{fixture.prefix}user0-0@example.com"
+        user = await project.loginUser_service.loginUser(
+            email, benchmarks.load_test.PASSWORD
+        )
+        id = fixture.user_ids[0]
+        statuses = {
+            "create admin anonymously": await request(
+                "POST", "/users", email="a@example.com", password="pw", role="Admin"
+            ),
+            "create admin as user": await request(
+                "POST",
+                "/users",
+                user.token,
+                email="b@example.com",
+                password="pw",
+                role="Admin",
+            ),
+            "create user anonymously": await request(
+                "POST", "/users", email="c@example.com", password="pw", role="User"
+            ),
+            "promote self": await request(
+                "PUT",
+                "/users/:id",
+                user.token,
+                id=id,
+                email=email,
+                password="pw",
+                role="Admin",
+            ),
+            "promote self via details": await request(
+                "PUT",
+                f"/api/users/{id}",
+                user.token,
+                id=id,
+                email=email,
+                password="pw",
+                role="Admin",
+            ),
+            "update self keeping role": await request(
+                "PUT",
+                "/users/:id",
+                user.token,
+                id=id,
+                email=email,
+                password="pw",
+                role="User",
+            ),
+        }
+        role_after_user = (
+            await prisma.models.User.prisma().find_unique(where={"id": id})
+        ).role
+        statuses["create admin as admin"] = await request(
+            "POST",
+            "/users",
+            fixture.token,
+            email="d@example.com",
+            password="pw",
+            role="Admin",
+        )
+        statuses["promote as admin"] = await request(
+            "PUT",
+            f"/api/users/{id}",
+            fixture.token,
+            id=id,
+            email=email,
+            password="pw",
+            role="Admin",
+        )
+        return statuses, role_after_user
+
+    statuses, role_after_user = asyncio.run(run())
+    assert statuses == {
+        "create admin anonymously": 403,
+        "create admin as user": 403,
+        "create user anonymously": 200,
+        "promote self": 403,
+        "promote self via details": 403,
+        "update self keeping role": 200,
+        "create admin as admin": 200,
+        "promote as admin": 200,
+    }
+    assert role_after_user == "User"
@@ -0,0 +1,33 @@
+import asyncio
+
+import benchmarks.load_test
+import httpx
+import project.server
+import pytest
+
+msgpack = pytest.importorskip("msgpack")
+
+
+async def get_both(path: str, headers: dict) -> tuple:
+    transport = httpx.ASGITransport(app=project.server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        as_json = await client.get(path, headers=headers)
+        as_msgpack = await client.get(
+            path, headers=dict(headers, accept="application/msgpack")
+        )
+    return as_json, as_msgpack
+
+
+@pytest.mark.parametrize("path", ["/hello", "/api/users?limit=2"])
+def test_msgpack_round_trip(memory_db, path):
+    async def run():
+        fixture = benchmarks.load_test.Fixture(3)
+        await fixture.seed()
+        return await get_both(path, {"authorization": f"Bearer {fixture.token}"})
+
+    as_json, as_msgpack = asyncio.run(run())
+    assert as_json.status_code == as_msgpack.status_code == 200
+    assert as_json.headers["content-type"] == "application/json"
+    assert as_msgpack.headers["content-type"] == "application/msgpack"
+    assert "Accept" in as_msgpack.headers["vary"]
+    assert msgpack.unpackb(as_msgpack.content) == as_json.json()
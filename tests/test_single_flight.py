@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from project.single_flight import SingleFlight
+
+
+def test_call_cancelled_by_its_last_waiter_is_not_joined():
+    calls = []
+
+    async def work():
+        calls.append(True)
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            # Cleanup takes a while, during which the cancelled call is still running.
+            await asyncio.sleep(0.01)
+            raise
+        return len(calls)
+
+    async def run():
+        group = SingleFlight("test")
+        first = asyncio.create_task(group.do(1, work))
+        await asyncio.sleep(0.001)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        # Arrives while the cancelled call is still cleaning up: starts a new call.
+        second = asyncio.create_task(group.do(1, work))
+        await asyncio.sleep(0.001)
+        calls_started = len(calls)
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        return calls_started
+
+    assert asyncio.run(run()) == 2
+
+
+def test_cancelled_waiter_does_not_cancel_the_others():
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        group = SingleFlight("test")
+        first = asyncio.create_task(group.do(1, work))
+        second = asyncio.create_task(group.do(1, work))
+        await asyncio.sleep(0.001)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
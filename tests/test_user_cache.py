@@ -0,0 +1,56 @@
+import asyncio
+import copy
+
+import prisma.models
+import project.updateUser_service
+import project.user_cache
+import project.user_loader
+
+
+def test_load_racing_a_write_does_not_cache_the_stale_row(memory_db, monkeypatch):
+    async def run():
+        user = await prisma.models.User.prisma().create(
+            data={"email": "a@example.com", "password": "x"}
+        )
+        read = asyncio.Event()
+        written = asyncio.Event()
+        load = project.user_loader.user_loader.load
+
+        async def load_before_write(id: int):
+            # Reads the row, then answers only after the write has landed.
+            row = copy.copy(await load(id))
+            read.set()
+            await written.wait()
+            return row
+
+        monkeypatch.setattr(project.user_loader.user_loader, "load", load_before_write)
+        racing = asyncio.create_task(project.user_cache.user_cache.get_by_id(user.id))
+        await read.wait()
+        monkeypatch.setattr(project.user_loader.user_loader, "load", load)
+        await project.updateUser_service.updateUser(
+            user.id, "b@example.com", None, project.updateUser_service.Role.User
+        )
+        written.set()
+        stale = await racing
+        return stale, await project.user_cache.user_cache.get_by_id(user.id)
+
+    stale, cached = asyncio.run(run())
+    # The racing load returns what it read, but the cache keeps the written row.
+    assert stale.email == "a@example.com"
+    assert (cached.email, cached.version) == ("b@example.com", 1)
+
+
+def test_read_does_not_replace_a_newer_entry(memory_db):
+    async def run():
+        user = await prisma.models.User.prisma().create(
+            data={"email": "a@example.com", "password": "x"}
+        )
+        old = copy.copy(user)
+        user.email, user.version = "b@example.com", 1
+        await project.user_cache.user_cache.put(user)
+        # A read that started before the write, e.g. on another worker, stores its row late.
+        await project.user_cache.user_cache.put(old, written=False)
+        return await project.user_cache.user_cache.get_by_id(user.id)
+
+    cached = asyncio.run(run())
+    assert (cached.email, cached.version) == ("b@example.com", 1)